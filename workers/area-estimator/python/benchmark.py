@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Scale Benchmark for the Floor Area Estimator
+Synthesizes realistic building tables and measures the floor area calculation
+without needing a populated buildings database.
+
+Synthetic buildings follow the GWR code distribution of FLOOR_HEIGHT_LOOKUP
+(mostly residential), log-normal footprints, floor counts and heights derived
+from the lookup floor heights, and configurable missing-data ratios.
+
+Every size is run through:
+- rowwise: the original per-building calculation (iterrows), kept verbatim
+  here as the reference implementation; only the first --rowwise-limit rows
+- vectorized: BuildingFloorAreaEstimator.process_buildings
+
+With --db, a throwaway table is created in a local PostgreSQL database and the
+database paths are measured as well (load + vectorized + COPY write-back, and
+the set-based --in-db UPDATE). The table is dropped afterwards unless --keep-table.
+
+Each path is reported with throughput, peak Python memory (tracemalloc, measured
+in a separate pass so tracing does not distort the timing) and whether its
+output equals the reference.
+
+Usage:
+    python benchmark.py [--sizes 10000 1000000 5000000] [options]
+    python benchmark.py --db <db_connection> [options]
+
+Example:
+    python benchmark.py --sizes 10000 1000000 --rowwise-limit 100000
+    python benchmark.py --db "postgresql://postgres@localhost:5432/scratch" --sizes 10000 1000000
+"""
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from main import (
+    ACCURACY_HIGH,
+    ACCURACY_LOW,
+    ACCURACY_MEDIUM,
+    BUILDING_COLUMNS,
+    BuildingFloorAreaEstimator,
+    DB_RESULT_COLUMNS,
+    DEFAULT_COMMIT_SIZE,
+    DEFAULT_FLOOR_HEIGHT,
+    DEFAULT_RESULT_BATCH_SIZE,
+    FLOOR_HEIGHT_LOOKUP,
+    RESIDENTIAL_CLASS_PREFIX,
+    RESULT_COLUMNS,
+    _average_floor_heights,
+    _numeric_column,
+)
+
+DEFAULT_SIZES = [10_000, 1_000_000, 5_000_000]
+
+# The row-wise path takes about a minute per million buildings
+DEFAULT_ROWWISE_LIMIT = 1_000_000
+
+DEFAULT_TABLE = 'public.area_benchmark_buildings'
+
+# Share of buildings with a residential GKLAS code (11xx), roughly the Swiss building stock
+RESIDENTIAL_SHARE = 0.70
+
+# GKAT codes drawn for residential and other buildings, with probabilities
+RESIDENTIAL_CATEGORIES = (['1020', '1030', '1010'], [0.85, 0.12, 0.03])
+OTHER_CATEGORIES = (['1060', '1040', '1080'], [0.60, 0.30, 0.10])
+
+# Share of buildings with a GKLAS code that is not in the lookup table
+UNKNOWN_CLASS_SHARE = 0.01
+
+# Share of buildings with an implausible (> 200 m) mean height
+IMPLAUSIBLE_HEIGHT_SHARE = 0.0005
+
+# Share of missing values per input column
+MISSING_RATIOS = {
+    'area_footprint_m2': 0.005,
+    'volume_above_ground_m3': 0.03,
+    'height_mean_m': 0.30,
+    'category': 0.02,
+    'class': 0.12,
+}
+
+# Result columns rounded to cents; the --in-db path may differ from the
+# reference by one cent in these (see compare_results)
+ROUNDED_COLUMNS = ['area_floor_total_m2', 'area_floor_above_ground_m2', '_height_mean_m', '_floor_height_used']
+ROUNDING_TOLERANCE = 0.01 + 1e-9
+
+# Columns of the throwaway benchmark table
+TABLE_COLUMNS = [
+    ('id', 'bigint PRIMARY KEY'),
+    ('egid', 'bigint'),
+    ('area_footprint_m2', 'numeric'),
+    ('volume_above_ground_m3', 'numeric'),
+    ('height_mean_m', 'numeric'),
+    ('category', 'text'),
+    ('class', 'text'),
+    ('area_floor_total_m2', 'numeric'),
+    ('area_floor_above_ground_m2', 'numeric'),
+    ('area_accuracy', 'text'),
+    ('floors_total', 'integer'),
+    ('floors_above', 'integer'),
+    ('floors_accuracy', 'text'),
+    ('updated_at', 'timestamptz'),
+]
+
+
+def synthesize_buildings(count, seed=0, missing_ratios=MISSING_RATIOS):
+    """
+    Generate a synthetic buildings table with BUILDING_COLUMNS.
+
+    GWR codes are drawn from FLOOR_HEIGHT_LOOKUP, mean heights from a floor
+    count and the floor height of the drawn class, volumes from footprint times
+    height. Missing values are set per column with the given ratios.
+
+    Returns: DataFrame with count buildings
+    """
+    rng = np.random.default_rng(seed)
+
+    classes = np.array([code for code, entry in FLOOR_HEIGHT_LOOKUP.items() if entry[4] == 'GKLAS'], dtype=object)
+    residential = np.array([code.startswith(RESIDENTIAL_CLASS_PREFIX) for code in classes])
+    class_weights = np.where(residential, RESIDENTIAL_SHARE / residential.sum(),
+                             (1 - RESIDENTIAL_SHARE) / (~residential).sum())
+    class_index = rng.choice(len(classes), size=count, p=class_weights)
+    building_class = classes[class_index]
+    is_residential = residential[class_index]
+
+    category = np.where(
+        is_residential,
+        rng.choice(np.array(RESIDENTIAL_CATEGORIES[0], dtype=object), size=count, p=RESIDENTIAL_CATEGORIES[1]),
+        rng.choice(np.array(OTHER_CATEGORIES[0], dtype=object), size=count, p=OTHER_CATEGORIES[1]),
+    )
+    building_class[rng.random(count) < UNKNOWN_CLASS_SHARE] = '9999'
+
+    # Heights from floor count and the floor height of the drawn class
+    floor_heights = np.array([sum(_average_floor_heights(FLOOR_HEIGHT_LOOKUP[code])) / 2 for code in classes])
+    floors = 1 + rng.poisson(np.where(is_residential, 1.5, 0.8))
+    height = floors * floor_heights[class_index] * rng.uniform(0.9, 1.15, count)
+    height[rng.random(count) < IMPLAUSIBLE_HEIGHT_SHARE] *= 100
+
+    footprint = np.clip(rng.lognormal(np.log(110), 0.9, count), 5, 50000)
+
+    buildings = pd.DataFrame({
+        'id': np.arange(1, count + 1, dtype=np.int64),
+        'egid': rng.permutation(count).astype(np.int64) + 100000,
+        'area_footprint_m2': np.round(footprint, 2),
+        'volume_above_ground_m3': np.round(footprint * height, 2),
+        'height_mean_m': np.round(height * rng.uniform(0.97, 1.03, count), 2),
+        'category': category,
+        'class': building_class,
+    }, columns=BUILDING_COLUMNS)
+
+    for name, ratio in missing_ratios.items():
+        missing = rng.random(count) < ratio
+        buildings[name] = buildings[name].where(~missing, np.nan if buildings[name].dtype.kind == 'f' else None)
+
+    return buildings
+
+
+class ReferenceFloorAreaEstimator:
+    """
+    The original per-building floor area calculation, kept verbatim as the
+    reference for the vectorized and database paths.
+
+    get_floor_height, determine_accuracy and calculate_floor_area are copied
+    unchanged from main.py as it was before calculate_floor_areas replaced them.
+    """
+
+    def get_floor_height(self, category, building_class):
+        """
+        Look up floor height parameters based on building classification.
+
+        Priority:
+        1. Check GKLAS (building class) first for specific match
+        2. Fall back to GKAT (category) if no GKLAS match
+        3. Use default residential values if nothing matches
+
+        Returns: (floor_height_min, floor_height_max, schema_used, description)
+        """
+        # Try GKLAS first (more specific)
+        if building_class and str(building_class) in FLOOR_HEIGHT_LOOKUP:
+            entry = FLOOR_HEIGHT_LOOKUP[str(building_class)]
+            if entry[4] == 'GKLAS':
+                # Use average of EG and RG for simplicity
+                min_height = (entry[0] + entry[2]) / 2
+                max_height = (entry[1] + entry[3]) / 2
+                return (min_height, max_height, 'GKLAS', entry[5])
+
+        # Try GKAT (category)
+        if category and str(category) in FLOOR_HEIGHT_LOOKUP:
+            entry = FLOOR_HEIGHT_LOOKUP[str(category)]
+            if entry[4] == 'GKAT':
+                min_height = (entry[0] + entry[2]) / 2
+                max_height = (entry[1] + entry[3]) / 2
+                return (min_height, max_height, 'GKAT', entry[5])
+
+        # Default fallback
+        entry = DEFAULT_FLOOR_HEIGHT
+        min_height = (entry[0] + entry[2]) / 2
+        max_height = (entry[1] + entry[3]) / 2
+        return (min_height, max_height, 'DEFAULT', entry[5])
+
+    def determine_accuracy(self, category, building_class, has_volume, has_footprint):
+        """
+        Determine accuracy level based on data quality and building type.
+        """
+        if not has_volume or not has_footprint:
+            return ACCURACY_LOW
+
+        # Check if we have classification data
+        has_classification = category is not None or building_class is not None
+
+        if not has_classification:
+            return ACCURACY_LOW
+
+        # Residential buildings (GKAT 1020 or GKLAS 11xx) have best accuracy
+        cat_str = str(category) if category else ''
+        class_str = str(building_class) if building_class else ''
+
+        if cat_str == '1020' or class_str.startswith('11'):
+            return ACCURACY_HIGH
+
+        # Commercial/office buildings
+        if class_str in ['1220', '1230', '1231', '1263', '1264']:
+            return ACCURACY_MEDIUM
+
+        # Industrial and special use buildings have lower accuracy
+        if class_str in ['1251', '1252', '1265', '1272'] or cat_str in ['1060', '1080']:
+            return ACCURACY_LOW
+
+        return ACCURACY_MEDIUM
+
+    def calculate_floor_area(self, row):
+        """
+        Calculate floor area estimates for a single building.
+
+        Methodology:
+        1. Get mean height from volume/footprint or use pre-calculated height_mean_m
+        2. Look up floor height based on building classification
+        3. Calculate floor count: mean_height / floor_height
+        4. Calculate floor area: footprint × floor_count
+        """
+        building_id = row['id']
+        footprint_area = row.get('area_footprint_m2')
+        volume = row.get('volume_above_ground_m3')
+        height_mean = row.get('height_mean_m')
+        category = row.get('category')
+        building_class = row.get('class')
+
+        # Initialize result
+        result = {
+            'id': building_id,
+            'area_floor_total_m2': None,
+            'area_floor_above_ground_m2': None,
+            'area_accuracy': None,
+            'floors_total': None,
+            'floors_above': None,
+            'floors_accuracy': None,
+            'status': 'error',
+            'error_message': None
+        }
+
+        # Validate required data
+        if footprint_area is None or footprint_area <= 0:
+            result['error_message'] = 'Missing or invalid footprint area'
+            return result
+
+        if (volume is None or volume <= 0) and (height_mean is None or height_mean <= 0):
+            result['error_message'] = 'Missing volume and height data'
+            return result
+
+        # Calculate mean height if not available
+        if height_mean is None or height_mean <= 0:
+            height_mean = volume / footprint_area
+
+        # Sanity check on height (buildings shouldn't be > 200m typically)
+        if height_mean > 200:
+            result['error_message'] = f'Implausible mean height: {height_mean:.1f}m'
+            return result
+
+        # Get floor height parameters
+        floor_height_min, floor_height_max, schema_used, description = self.get_floor_height(
+            category, building_class
+        )
+
+        # Calculate floor count using min/max floor heights
+        # Higher floor height = fewer floors (use max height for min floors)
+        # Lower floor height = more floors (use min height for max floors)
+        floors_min = height_mean / floor_height_max
+        floors_max = height_mean / floor_height_min
+
+        # Use mean of min/max for estimate
+        floors_estimate = (floors_min + floors_max) / 2
+
+        # Round to reasonable values (at least 1 floor)
+        floors_estimate = max(1.0, floors_estimate)
+        floors_rounded = round(floors_estimate)
+
+        # Calculate floor areas
+        area_min = footprint_area * floors_min
+        area_max = footprint_area * floors_max
+        area_estimate = footprint_area * floors_estimate
+
+        # Determine accuracy
+        has_volume = volume is not None and volume > 0
+        has_footprint = footprint_area is not None and footprint_area > 0
+        accuracy = self.determine_accuracy(category, building_class, has_volume, has_footprint)
+
+        # Build result
+        result['area_floor_total_m2'] = round(area_estimate, 2)
+        result['area_floor_above_ground_m2'] = round(area_estimate, 2)  # Same as total (no underground estimate)
+        result['area_accuracy'] = accuracy
+        result['floors_total'] = floors_rounded
+        result['floors_above'] = floors_rounded  # Same as total (no underground estimate)
+        result['floors_accuracy'] = accuracy
+        result['status'] = 'success'
+
+        # Add debug info
+        result['_height_mean_m'] = round(height_mean, 2)
+        result['_floor_height_used'] = round((floor_height_min + floor_height_max) / 2, 2)
+        result['_schema_used'] = schema_used
+        result['_building_type'] = description
+
+        return result
+
+
+def process_buildings_reference(buildings_df):
+    """
+    Run the reference calculation over all buildings, one iterrows row at a time.
+
+    The rows are handed over the way pd.read_sql delivered them to the original
+    code: Python values, None for NULLs.
+
+    Returns: results DataFrame with RESULT_COLUMNS
+    """
+    rows = buildings_df.astype(object).where(buildings_df.notna(), None)
+    reference = ReferenceFloorAreaEstimator()
+    results = [reference.calculate_floor_area(row) for _, row in rows.iterrows()]
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
+
+
+def expected_db_results(reference, buildings_df):
+    """
+    Result columns the database paths should leave in the benchmark table.
+
+    Buildings without volume or footprint are not loaded and keep NULL results;
+    all others get their reference results, NULLs for failed buildings.
+
+    Returns: DataFrame with DB_RESULT_COLUMNS, in the row order of reference
+    """
+    buildings = buildings_df.iloc[:len(reference)]
+    loaded = ((_numeric_column(buildings, 'volume_above_ground_m3') > 0)
+              & (_numeric_column(buildings, 'area_footprint_m2') > 0))
+    expected = reference[DB_RESULT_COLUMNS].astype(object)
+    expected.loc[~loaded, DB_RESULT_COLUMNS[1:]] = None
+    return expected
+
+
+def process_buildings_vectorized(estimator, buildings_df, keep_rows):
+    """
+    Run the vectorized path in result batches, like a CSV/database run.
+
+    Only the first keep_rows results are kept (for the equivalence check).
+
+    Returns: results DataFrame of the first keep_rows buildings
+    """
+    kept = []
+    kept_count = 0
+
+    def on_batch(batch):
+        nonlocal kept_count
+        if kept_count < keep_rows:
+            kept.append(batch.iloc[:keep_rows - kept_count])
+            kept_count += len(kept[-1])
+
+    estimator.process_buildings(buildings_df, on_batch=on_batch)
+    return pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def compare_results(expected, actual, columns=RESULT_COLUMNS):
+    """
+    Compare two results tables column by column, exactly; missing values compare equal.
+
+    Differences in ROUNDED_COLUMNS of at most ROUNDING_TOLERANCE are counted
+    separately: PostgreSQL rounds the decimal value of a double half away from
+    zero, Python rounds the exact binary value, so the two can end up one cent
+    apart next to a tie.
+
+    Returns: dict of column -> (differing rows, of which within ROUNDING_TOLERANCE),
+    empty if the tables are identical
+    """
+    if len(expected) != len(actual):
+        return {'<rows>': (abs(len(expected) - len(actual)), 0)}
+
+    differences = {}
+    for name in columns:
+        left = np.array(expected[name], dtype=object)
+        right = np.array(actual[name], dtype=object)
+        left_missing = pd.isna(left)
+        right_missing = pd.isna(right)
+        both = ~left_missing & ~right_missing
+
+        equal = left_missing & right_missing
+        equal[both] = left[both] == right[both]
+        if equal.all():
+            continue
+
+        within_tolerance = np.zeros(len(left), dtype=bool)
+        if name in ROUNDED_COLUMNS:
+            within_tolerance[both] = np.abs(
+                left[both].astype(np.float64) - right[both].astype(np.float64)
+            ) <= ROUNDING_TOLERANCE
+        differences[name] = (int((~equal).sum()), int((~equal & within_tolerance).sum()))
+    return differences
+
+
+def measure(run, trace_memory=True):
+    """
+    Time run(), then run it again under tracemalloc for the peak memory.
+
+    Returns: (result of the timed run, seconds, peak MB or None)
+    """
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+
+    return result, elapsed, peak_mb
+
+
+def create_benchmark_table(conn, table_name, buildings_df):
+    """(Re)create the throwaway buildings table and load buildings_df into it with COPY"""
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+    cursor.execute(f"""
+        CREATE TABLE {table_name} (
+            {', '.join(f'{name} {sql_type}' for name, sql_type in TABLE_COLUMNS)}
+        )
+    """)
+
+    buffer = io.StringIO()
+    buildings_df.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table_name} ({', '.join(BUILDING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.execute(f"ANALYZE {table_name}")
+    conn.commit()
+    cursor.close()
+
+
+def reset_results(conn, table_name):
+    """Clear the result columns of the benchmark table"""
+    cursor = conn.cursor()
+    cursor.execute(f"UPDATE {table_name} SET {', '.join(f'{name} = NULL' for name in DB_RESULT_COLUMNS[1:])}")
+    conn.commit()
+    cursor.close()
+
+
+def read_results(conn, table_name, limit):
+    """Read the written result columns of the first limit buildings back, ordered by id"""
+    return pd.read_sql(f"SELECT {', '.join(DB_RESULT_COLUMNS)} FROM {table_name} ORDER BY id LIMIT {int(limit)}", conn)
+
+
+def benchmark_size(estimator, count, rowwise_limit, seed=0, db_conn=None, table_name=DEFAULT_TABLE,
+                   trace_memory=True):
+    """
+    Run all paths for one synthetic table size.
+
+    Every path is compared with the reference on the first rowwise_limit
+    buildings; only the --in-db path may differ from it within ROUNDING_TOLERANCE.
+
+    Returns: list of dicts with path, rows, seconds, rows_per_second, peak_mb,
+    differences (None if there is nothing to compare against) and
+    tolerates_rounding
+    """
+    print(f"\nSynthesizing {count:,} buildings...")
+    buildings = synthesize_buildings(count, seed=seed)
+    rowwise_rows = min(count, rowwise_limit)
+    rows = []
+
+    def record(path, path_rows, elapsed, peak_mb, differences, tolerates_rounding=False):
+        rows.append({
+            'path': path,
+            'rows': path_rows,
+            'seconds': elapsed,
+            'rows_per_second': path_rows / elapsed if elapsed > 0 else 0.0,
+            'peak_mb': peak_mb,
+            'differences': differences,
+            'tolerates_rounding': tolerates_rounding,
+        })
+
+    reference = None
+    if rowwise_rows:
+        print(f"Row-wise path on {rowwise_rows:,} buildings...")
+        reference, elapsed, peak_mb = measure(
+            lambda: process_buildings_reference(buildings.iloc[:rowwise_rows]), trace_memory
+        )
+        record('rowwise', rowwise_rows, elapsed, peak_mb, None)
+
+    print(f"Vectorized path on {count:,} buildings...")
+    vectorized, elapsed, peak_mb = measure(
+        lambda: process_buildings_vectorized(estimator, buildings, rowwise_rows), trace_memory
+    )
+    record('vectorized', count, elapsed, peak_mb,
+           compare_results(reference, vectorized) if reference is not None else None)
+
+    if db_conn is not None:
+        expected = expected_db_results(reference, buildings) if reference is not None else None
+        create_benchmark_table(db_conn, table_name, buildings)
+        estimator.ensure_input_hash_column(db_conn, table_name)
+        del buildings
+
+        def run_write_back():
+            reset_results(db_conn, table_name)
+            loaded = estimator.load_buildings_from_db(table_name=table_name)
+            estimator.process_buildings(
+                loaded,
+                on_batch=lambda batch: estimator.write_results_to_db(
+                    batch, table_name=table_name, conn=db_conn, commit_size=DEFAULT_COMMIT_SIZE
+                ),
+                batch_size=DEFAULT_RESULT_BATCH_SIZE,
+            )
+            return read_results(db_conn, table_name, rowwise_rows)
+
+        def run_in_db():
+            reset_results(db_conn, table_name)
+            estimator.update_floor_areas_in_db(table_name=table_name)
+            return read_results(db_conn, table_name, rowwise_rows)
+
+        print(f"Database write-back path on {count:,} buildings...")
+        written, elapsed, peak_mb = measure(run_write_back, trace_memory)
+        record('db write-back', count, elapsed, peak_mb,
+               compare_results(expected, written, DB_RESULT_COLUMNS) if expected is not None else None)
+
+        print(f"In-database path on {count:,} buildings...")
+        updated, elapsed, peak_mb = measure(run_in_db, trace_memory)
+        record('db in-db', count, elapsed, peak_mb,
+               compare_results(expected, updated, DB_RESULT_COLUMNS) if expected is not None else None,
+               tolerates_rounding=True)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the floor area estimator on synthetic building tables'
+    )
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help=f'Table sizes to benchmark (default: {" ".join(str(s) for s in DEFAULT_SIZES)})')
+    parser.add_argument('--rowwise-limit', type=int, default=DEFAULT_ROWWISE_LIMIT,
+                        help=f'Buildings run through the row-wise path per size, 0 to skip it '
+                             f'(default: {DEFAULT_ROWWISE_LIMIT})')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the synthetic tables (default: 0)')
+    parser.add_argument('--db',
+                        help='PostgreSQL connection string of a throwaway database to also benchmark the database paths')
+    parser.add_argument('--table-name', default=DEFAULT_TABLE,
+                        help=f'Benchmark table created with --db (default: {DEFAULT_TABLE})')
+    parser.add_argument('--keep-table', action='store_true',
+                        help='Keep the benchmark table after the run')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc pass (halves the run time, no peak memory)')
+
+    args = parser.parse_args()
+
+    estimator = BuildingFloorAreaEstimator(args.db)
+    db_conn = None
+    if args.db:
+        try:
+            db_conn = estimator.get_database_connection()
+        except Exception as e:
+            print(f"Error connecting to database: {e}", file=sys.stderr)
+            return 1
+
+    results = []
+    try:
+        for count in args.sizes:
+            for row in benchmark_size(estimator, count, args.rowwise_limit, seed=args.seed, db_conn=db_conn,
+                                      table_name=args.table_name, trace_memory=not args.no_memory):
+                results.append((count, row))
+    finally:
+        if db_conn is not None:
+            if not args.keep_table:
+                cursor = db_conn.cursor()
+                cursor.execute(f"DROP TABLE IF EXISTS {args.table_name}")
+                db_conn.commit()
+                cursor.close()
+            db_conn.close()
+
+    print("\n" + "=" * 78)
+    print("BENCHMARK")
+    print("=" * 78)
+    print(f"{'Size':>10}  {'Path':<14}{'Rows':>10}{'Seconds':>10}{'Rows/s':>12}{'Peak MB':>10}  Output")
+
+    mismatches = 0
+    for count, row in results:
+        peak = f"{row['peak_mb']:.0f}" if row['peak_mb'] is not None else '-'
+        differences = row['differences']
+        if differences is None:
+            output = 'reference' if row['path'] == 'rowwise' else '-'
+        elif not differences:
+            output = 'equal'
+        else:
+            summary = ', '.join(
+                f"{name} ({n}" + (f", {within} within {ROUNDING_TOLERANCE:.2f}" if within else '') + ')'
+                for name, (n, within) in differences.items()
+            )
+            if row['tolerates_rounding'] and all(n == within for n, within in differences.values()):
+                output = f'equal within {ROUNDING_TOLERANCE:.2f}: {summary}'
+            else:
+                output = f'DIFFERS: {summary}'
+                mismatches += 1
+        print(f"{count:>10,}  {row['path']:<14}{row['rows']:>10,}{row['seconds']:>10.2f}"
+              f"{row['rows_per_second']:>12,.0f}{peak:>10}  {output}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,12 @@ Based on Canton Zurich methodology (SEILER & SEILER GmbH, December 2020)
 """
 
 import argparse
+import hashlib
+import io
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2
 import pandas as pd
 import numpy as np
@@ -66,6 +71,335 @@ ACCURACY_HIGH = 'high'       # ±10-15% - residential buildings with clear class
 ACCURACY_MEDIUM = 'medium'   # ±15-25% - commercial/office buildings
 ACCURACY_LOW = 'low'         # ±25-40% - industrial, special use, or missing classification
 
+# Accuracy levels, floor height schemas and statuses as they appear in the results
+ACCURACY_LEVELS = [ACCURACY_HIGH, ACCURACY_MEDIUM, ACCURACY_LOW]
+FLOOR_HEIGHT_SCHEMAS = ['GKLAS', 'GKAT', 'DEFAULT']
+RESULT_STATUSES = ['success', 'error']
+
+# GWR codes with non-default accuracy (see determine_accuracy)
+RESIDENTIAL_CATEGORY = 1020
+RESIDENTIAL_CLASS_PREFIX = '11'
+MEDIUM_ACCURACY_CLASSES = [1220, 1230, 1231, 1263, 1264]
+LOW_ACCURACY_CLASSES = [1251, 1252, 1265, 1272]
+LOW_ACCURACY_CATEGORIES = [1060, 1080]
+
+# Code ranges covered by the compiled lookup arrays
+GKAT_CODE_RANGE = (1010, 1080)
+GKLAS_CODE_RANGE = (1110, 1274)
+
+# Accuracy tier of a code: index into ACCURACY_LEVELS, or no tier of its own
+ACCURACY_TIER_NONE = len(ACCURACY_LEVELS)
+
+RESULT_COLUMNS = [
+    'id',
+    'area_floor_total_m2',
+    'area_floor_above_ground_m2',
+    'area_accuracy',
+    'floors_total',
+    'floors_above',
+    'floors_accuracy',
+    'status',
+    'error_message',
+    '_height_mean_m',
+    '_floor_height_used',
+    '_schema_used',
+    '_building_type',
+]
+
+# Buildings per vectorized batch handed to the output sinks
+DEFAULT_RESULT_BATCH_SIZE = 10000
+
+# Building columns needed for the floor area calculation
+BUILDING_COLUMNS = [
+    'id',
+    'egid',
+    'area_footprint_m2',
+    'volume_above_ground_m3',
+    'height_mean_m',
+    'category',
+    'class',
+]
+
+# Inputs of the floor area calculation; a building is recalculated by
+# --incremental runs when any of them changed since its last write
+INPUT_COLUMNS = [
+    'volume_above_ground_m3',
+    'height_mean_m',
+    'area_footprint_m2',
+    'category',
+    'class',
+]
+
+# Column storing the hash of INPUT_COLUMNS the written floor areas were calculated from
+INPUT_HASH_COLUMN = 'area_input_hash'
+
+# Version of the floor area calculation; bump it when the method changes so
+# that --incremental runs recalculate every building
+AREA_METHOD_VERSION = 1
+
+# Fingerprint of the method and its lookup tables, hashed together with the
+# inputs: changing either makes every stored input hash stale
+AREA_METHOD_HASH = hashlib.md5(repr((
+    AREA_METHOD_VERSION,
+    FLOOR_HEIGHT_LOOKUP,
+    DEFAULT_FLOOR_HEIGHT,
+    RESIDENTIAL_CATEGORY,
+    RESIDENTIAL_CLASS_PREFIX,
+    MEDIUM_ACCURACY_CLASSES,
+    LOW_ACCURACY_CLASSES,
+    LOW_ACCURACY_CATEGORIES,
+)).encode()).hexdigest()
+
+# Columns a run can be partitioned by (--partition-by)
+PARTITION_COLUMNS = ['municipality_nr', 'region']
+
+# Result columns written back to the buildings table
+DB_RESULT_COLUMNS = [
+    'id',
+    'area_floor_total_m2',
+    'area_floor_above_ground_m2',
+    'area_accuracy',
+    'floors_total',
+    'floors_above',
+    'floors_accuracy',
+]
+
+# Rows per COPY + UPDATE transaction when writing results
+DEFAULT_COMMIT_SIZE = 10000
+
+# Floor height lookup table installed for --in-db runs
+DEFAULT_LOOKUP_TABLE = 'public.floor_height_lookup'
+
+
+def _average_floor_heights(entry):
+    """(min, max) floor height of a lookup entry, EG and RG averaged for simplicity"""
+    return (entry[0] + entry[2]) / 2, (entry[1] + entry[3]) / 2
+
+
+def _compile_floor_height_lookup(schema, code_range):
+    """
+    Compile the FLOOR_HEIGHT_LOOKUP entries of one schema into dense arrays.
+
+    Every array is indexed by (integer GWR code - first code of code_range), so
+    classifying buildings is a plain array gather. Codes without an entry have
+    NaN floor heights; the accuracy tier follows the rules of determine_accuracy.
+
+    Returns: dict with first_code, floor_height_min, floor_height_max,
+    description and accuracy_tier arrays
+    """
+    first_code, last_code = code_range
+    size = last_code - first_code + 1
+    high, medium, low = (ACCURACY_LEVELS.index(level) for level in (ACCURACY_HIGH, ACCURACY_MEDIUM, ACCURACY_LOW))
+
+    lookup = {
+        'first_code': first_code,
+        'floor_height_min': np.full(size, np.nan),
+        'floor_height_max': np.full(size, np.nan),
+        'description': np.full(size, None, dtype=object),
+        'accuracy_tier': np.full(size, ACCURACY_TIER_NONE, dtype=np.int8),
+    }
+
+    for code, entry in FLOOR_HEIGHT_LOOKUP.items():
+        if entry[4] == schema:
+            i = int(code) - first_code
+            lookup['floor_height_min'][i], lookup['floor_height_max'][i] = _average_floor_heights(entry)
+            lookup['description'][i] = entry[5]
+
+    for code in range(first_code, last_code + 1):
+        i = code - first_code
+        if schema == 'GKLAS':
+            if str(code).startswith(RESIDENTIAL_CLASS_PREFIX):
+                lookup['accuracy_tier'][i] = high
+            elif code in MEDIUM_ACCURACY_CLASSES:
+                lookup['accuracy_tier'][i] = medium
+            elif code in LOW_ACCURACY_CLASSES:
+                lookup['accuracy_tier'][i] = low
+        else:
+            if code == RESIDENTIAL_CATEGORY:
+                lookup['accuracy_tier'][i] = high
+            elif code in LOW_ACCURACY_CATEGORIES:
+                lookup['accuracy_tier'][i] = low
+
+    return lookup
+
+
+GKLAS_LOOKUP = _compile_floor_height_lookup('GKLAS', GKLAS_CODE_RANGE)
+GKAT_LOOKUP = _compile_floor_height_lookup('GKAT', GKAT_CODE_RANGE)
+DEFAULT_FLOOR_HEIGHT_MIN, DEFAULT_FLOOR_HEIGHT_MAX = _average_floor_heights(DEFAULT_FLOOR_HEIGHT)
+
+
+def _gather(lookup, name, codes, missing):
+    """Values of one compiled lookup array for integer codes, missing for codes outside its range"""
+    values = lookup[name]
+    positions = codes - lookup['first_code']
+    inside = (positions >= 0) & (positions < len(values))
+
+    gathered = np.full(len(codes), missing, dtype=values.dtype)
+    gathered[inside] = values[positions[inside]]
+    return gathered
+
+
+def _numeric_column(df, name):
+    """Column as float64 array, NaN for missing values (or if the column does not exist)"""
+    if name not in df:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _round(values, decimals=2):
+    """
+    Round an array exactly like Python's round(x, decimals).
+
+    np.round scales by 10**decimals first, which can push values next to a
+    .5 tie to the wrong side (e.g. round(6.525, 2) vs np.round). Values whose
+    scaled fraction is that close to .5 are rounded with Python's round.
+    """
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    with np.errstate(invalid='ignore'):
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    if near_tie.any():
+        rounded[near_tie] = [round(value, decimals) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def _code_column(df, name):
+    """
+    GWR code column as integer codes.
+
+    Returns: (codes, present) with code -1 where the value is missing or not
+    numeric; present marks all non-null values
+    """
+    if name not in df:
+        return np.full(len(df), -1, dtype=np.int64), np.zeros(len(df), dtype=bool)
+
+    # Parse each distinct value once and broadcast through the factorized rows
+    rows, values = pd.factorize(df[name])
+    value_codes = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    value_codes = np.where(np.isnan(value_codes), -1, value_codes).astype(np.int64)
+    return np.append(value_codes, -1)[rows], rows >= 0
+
+
+def input_hash_sql(alias=None):
+    """
+    SQL expression hashing the INPUT_COLUMNS of a building row.
+
+    The inputs are prefixed with AREA_METHOD_HASH, so a new method version or
+    lookup table changes the hash as well. NULLs are hashed as empty strings,
+    so a value appearing or disappearing changes the hash. alias prefixes the
+    columns (e.g. 'b').
+    """
+    prefix = f"{alias}." if alias else ""
+    values = ', '.join(f"COALESCE({prefix}{name}::text, '')" for name in INPUT_COLUMNS)
+    return f"md5(concat_ws('|', '{AREA_METHOD_HASH}', {values}))"
+
+
+def _building_select_list():
+    """SELECT list of BUILDING_COLUMNS followed by the current input hash"""
+    return f"{', '.join(BUILDING_COLUMNS)}, {input_hash_sql()} AS {INPUT_HASH_COLUMN}"
+
+
+def _sql_list(values):
+    """Quote a list of values as strings for an SQL IN (...) list"""
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def build_floor_area_update_sql(table_name, lookup_table=DEFAULT_LOOKUP_TABLE, filters=''):
+    """
+    Generate the set-based UPDATE that computes all floor area columns in the database.
+
+    Mirrors load_buildings_from_db + calculate_floor_areas + write_results_to_db:
+    same selection (volume and footprint > 0), validation, floor height
+    priority (GKLAS, then GKAT, then default) and accuracy tiers, read from the
+    lookup table installed by install_floor_height_table. Arithmetic is done in
+    double precision like NumPy; the floor area columns of buildings that fail
+    validation are left untouched, like write_results_to_db skips them. filters is appended to the WHERE clause of the buildings scan
+    (columns prefixed with b.). The input hash of every evaluated building,
+    updated or rejected, is stored in INPUT_HASH_COLUMN, so --incremental does
+    not select rejected buildings again until their inputs change.
+    """
+    return f"""
+        WITH estimates AS (
+            SELECT
+                b.id,
+                {input_hash_sql('b')} AS input_hash,
+                b.area_footprint_m2::double precision AS footprint_area,
+                CASE WHEN b.height_mean_m > 0 THEN b.height_mean_m::double precision
+                     ELSE b.volume_above_ground_m3::double precision
+                          / NULLIF(b.area_footprint_m2, 0)::double precision
+                END AS height_mean,
+                COALESCE(cl.floor_height_min, ct.floor_height_min, {DEFAULT_FLOOR_HEIGHT_MIN!r}::double precision)
+                    AS floor_height_min,
+                COALESCE(cl.floor_height_max, ct.floor_height_max, {DEFAULT_FLOOR_HEIGHT_MAX!r}::double precision)
+                    AS floor_height_max,
+                CASE
+                    WHEN COALESCE(b.volume_above_ground_m3, 0) <= 0
+                         OR (b.category IS NULL AND b.class IS NULL) THEN '{ACCURACY_LOW}'
+                    -- Best tier of class and category, codes without a tier of their own are medium
+                    ELSE (ARRAY[{_sql_list(ACCURACY_LEVELS + [ACCURACY_MEDIUM])}])[
+                        LEAST(COALESCE(cl.accuracy_tier, {ACCURACY_TIER_NONE}),
+                              COALESCE(ct.accuracy_tier, {ACCURACY_TIER_NONE})) + 1]
+                END AS accuracy
+            FROM {table_name} b
+            LEFT JOIN {lookup_table} cl ON cl.schema = 'GKLAS' AND cl.code::text = b.class::text
+            LEFT JOIN {lookup_table} ct ON ct.schema = 'GKAT' AND ct.code::text = b.category::text
+            WHERE b.area_footprint_m2 > 0
+              AND b.volume_above_ground_m3 > 0
+              {filters}
+        ),
+        floors AS (
+            -- Mean of the floor counts at max and min floor height, at least 1 floor
+            SELECT
+                id,
+                input_hash,
+                footprint_area,
+                accuracy,
+                GREATEST(1.0, (height_mean / floor_height_max + height_mean / floor_height_min) / 2)
+                    AS floors_estimate
+            FROM estimates
+            WHERE height_mean <= 200
+        ),
+        rejected AS (
+            -- Buildings failing validation only record that their inputs were evaluated
+            UPDATE {table_name} b
+            SET {INPUT_HASH_COLUMN} = e.input_hash
+            FROM estimates e
+            WHERE b.id = e.id
+              AND (e.height_mean IS NULL OR e.height_mean > 200)
+        )
+        UPDATE {table_name} b
+        SET
+            area_floor_total_m2 = ROUND((f.footprint_area * f.floors_estimate)::numeric, 2),
+            area_floor_above_ground_m2 = ROUND((f.footprint_area * f.floors_estimate)::numeric, 2),
+            area_accuracy = f.accuracy,
+            floors_total = ROUND(f.floors_estimate)::integer,
+            floors_above = ROUND(f.floors_estimate)::integer,
+            floors_accuracy = f.accuracy,
+            {INPUT_HASH_COLUMN} = f.input_hash,
+            updated_at = NOW()
+        FROM floors f
+        WHERE b.id = f.id
+    """
+
+
+def read_building_ids(path):
+    """
+    Read building IDs from a file, or from stdin if path is '-'.
+
+    IDs may be separated by newlines, commas or whitespace. Lines starting
+    with '#' are ignored.
+    """
+    stream = sys.stdin if path == '-' else open(path)
+    try:
+        building_ids = []
+        for line in stream:
+            line = line.split('#', 1)[0]
+            building_ids.extend(int(token) for token in line.replace(',', ' ').split())
+        return building_ids
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
 
 class BuildingFloorAreaEstimator:
     """
@@ -79,9 +413,9 @@ class BuildingFloorAreaEstimator:
         """Create a database connection"""
         return psycopg2.connect(self.db_connection)
 
-    def get_floor_height(self, category, building_class):
+    def get_floor_heights(self, categories, building_classes):
         """
-        Look up floor height parameters based on building classification.
+        Look up floor height parameters for arrays of integer GKAT/GKLAS codes.
 
         Priority:
         1. Check GKLAS (building class) first for specific match
@@ -89,111 +423,86 @@ class BuildingFloorAreaEstimator:
         3. Use default residential values if nothing matches
 
         Returns: (floor_height_min, floor_height_max, schema_used, description)
+        arrays, schema_used as codes into FLOOR_HEIGHT_SCHEMAS
         """
-        # Try GKLAS first (more specific)
-        if building_class and str(building_class) in FLOOR_HEIGHT_LOOKUP:
-            entry = FLOOR_HEIGHT_LOOKUP[str(building_class)]
-            if entry[4] == 'GKLAS':
-                # Use average of EG and RG for simplicity
-                min_height = (entry[0] + entry[2]) / 2
-                max_height = (entry[1] + entry[3]) / 2
-                return (min_height, max_height, 'GKLAS', entry[5])
-
-        # Try GKAT (category)
-        if category and str(category) in FLOOR_HEIGHT_LOOKUP:
-            entry = FLOOR_HEIGHT_LOOKUP[str(category)]
-            if entry[4] == 'GKAT':
-                min_height = (entry[0] + entry[2]) / 2
-                max_height = (entry[1] + entry[3]) / 2
-                return (min_height, max_height, 'GKAT', entry[5])
-
-        # Default fallback
-        entry = DEFAULT_FLOOR_HEIGHT
-        min_height = (entry[0] + entry[2]) / 2
-        max_height = (entry[1] + entry[3]) / 2
-        return (min_height, max_height, 'DEFAULT', entry[5])
-
-    def determine_accuracy(self, category, building_class, has_volume, has_footprint):
-        """
-        Determine accuracy level based on data quality and building type.
+        class_min = _gather(GKLAS_LOOKUP, 'floor_height_min', building_classes, np.nan)
+        category_min = _gather(GKAT_LOOKUP, 'floor_height_min', categories, np.nan)
+        use_class = ~np.isnan(class_min)
+        use_category = ~use_class & ~np.isnan(category_min)
+
+        floor_height_min = np.where(use_class, class_min,
+                                    np.where(use_category, category_min, DEFAULT_FLOOR_HEIGHT_MIN))
+        floor_height_max = np.where(use_class, _gather(GKLAS_LOOKUP, 'floor_height_max', building_classes, np.nan),
+                                    np.where(use_category, _gather(GKAT_LOOKUP, 'floor_height_max', categories, np.nan),
+                                             DEFAULT_FLOOR_HEIGHT_MAX))
+        schema_used = np.where(use_class, FLOOR_HEIGHT_SCHEMAS.index('GKLAS'),
+                               np.where(use_category, FLOOR_HEIGHT_SCHEMAS.index('GKAT'),
+                                        FLOOR_HEIGHT_SCHEMAS.index('DEFAULT'))).astype(np.int8)
+        description = np.where(use_class, _gather(GKLAS_LOOKUP, 'description', building_classes, None),
+                               np.where(use_category, _gather(GKAT_LOOKUP, 'description', categories, None),
+                                        DEFAULT_FLOOR_HEIGHT[5]))
+
+        return floor_height_min, floor_height_max, schema_used, description
+
+    def determine_accuracy(self, categories, building_classes, has_classification, has_volume, has_footprint):
         """
-        if not has_volume or not has_footprint:
-            return ACCURACY_LOW
-
-        # Check if we have classification data
-        has_classification = category is not None or building_class is not None
-
-        if not has_classification:
-            return ACCURACY_LOW
-
-        # Residential buildings (GKAT 1020 or GKLAS 11xx) have best accuracy
-        cat_str = str(category) if category else ''
-        class_str = str(building_class) if building_class else ''
+        Determine accuracy levels based on data quality and building type.
 
-        if cat_str == '1020' or class_str.startswith('11'):
-            return ACCURACY_HIGH
+        The best accuracy tier of class and category wins (e.g. residential
+        GKAT 1020 or GKLAS 11xx is high); codes without a tier of their own
+        are medium. Missing volume, footprint or classification is always low.
 
-        # Commercial/office buildings
-        if class_str in ['1220', '1230', '1231', '1263', '1264']:
-            return ACCURACY_MEDIUM
-
-        # Industrial and special use buildings have lower accuracy
-        if class_str in ['1251', '1252', '1265', '1272'] or cat_str in ['1060', '1080']:
-            return ACCURACY_LOW
-
-        return ACCURACY_MEDIUM
+        Returns: codes into ACCURACY_LEVELS
+        """
+        tier = np.minimum(_gather(GKLAS_LOOKUP, 'accuracy_tier', building_classes, ACCURACY_TIER_NONE),
+                          _gather(GKAT_LOOKUP, 'accuracy_tier', categories, ACCURACY_TIER_NONE))
+        tier[tier == ACCURACY_TIER_NONE] = ACCURACY_LEVELS.index(ACCURACY_MEDIUM)
+        tier[~has_volume | ~has_footprint | ~has_classification] = ACCURACY_LEVELS.index(ACCURACY_LOW)
+        return tier
 
-    def calculate_floor_area(self, row):
+    def calculate_floor_areas(self, buildings_df):
         """
-        Calculate floor area estimates for a single building.
+        Calculate floor area estimates for a DataFrame of buildings.
+
+        All steps are evaluated column-wise over the whole DataFrame.
 
         Methodology:
         1. Get mean height from volume/footprint or use pre-calculated height_mean_m
         2. Look up floor height based on building classification
         3. Calculate floor count: mean_height / floor_height
         4. Calculate floor area: footprint × floor_count
+
+        Returns: results DataFrame with RESULT_COLUMNS, one row per building,
+        plus INPUT_HASH_COLUMN if buildings_df has it (see load_buildings_from_db)
         """
-        building_id = row['id']
-        footprint_area = row.get('area_footprint_m2')
-        volume = row.get('volume_above_ground_m3')
-        height_mean = row.get('height_mean_m')
-        category = row.get('category')
-        building_class = row.get('class')
-
-        # Initialize result
-        result = {
-            'id': building_id,
-            'area_floor_total_m2': None,
-            'area_floor_above_ground_m2': None,
-            'area_accuracy': None,
-            'floors_total': None,
-            'floors_above': None,
-            'floors_accuracy': None,
-            'status': 'error',
-            'error_message': None
-        }
-
-        # Validate required data
-        if footprint_area is None or footprint_area <= 0:
-            result['error_message'] = 'Missing or invalid footprint area'
-            return result
-
-        if (volume is None or volume <= 0) and (height_mean is None or height_mean <= 0):
-            result['error_message'] = 'Missing volume and height data'
-            return result
+        footprint_area = _numeric_column(buildings_df, 'area_footprint_m2')
+        volume = _numeric_column(buildings_df, 'volume_above_ground_m3')
+        height_mean = _numeric_column(buildings_df, 'height_mean_m')
+        categories, has_category = _code_column(buildings_df, 'category')
+        building_classes, has_class = _code_column(buildings_df, 'class')
+
+        # Validate required data (NaN compares as False, so missing values are invalid)
+        has_footprint = footprint_area > 0
+        has_volume = volume > 0
+        has_height = height_mean > 0
 
         # Calculate mean height if not available
-        if height_mean is None or height_mean <= 0:
-            height_mean = volume / footprint_area
+        with np.errstate(divide='ignore', invalid='ignore'):
+            height_mean = np.where(has_height, height_mean, volume / footprint_area)
 
         # Sanity check on height (buildings shouldn't be > 200m typically)
-        if height_mean > 200:
-            result['error_message'] = f'Implausible mean height: {height_mean:.1f}m'
-            return result
+        implausible = has_footprint & (has_volume | has_height) & (height_mean > 200)
+        success = has_footprint & (has_volume | has_height) & ~implausible
+        failed = ~success
+
+        error_message = np.full(len(buildings_df), None, dtype=object)
+        error_message[implausible] = [f'Implausible mean height: {h:.1f}m' for h in height_mean[implausible]]
+        error_message[~(has_volume | has_height)] = 'Missing volume and height data'
+        error_message[~has_footprint] = 'Missing or invalid footprint area'
 
         # Get floor height parameters
-        floor_height_min, floor_height_max, schema_used, description = self.get_floor_height(
-            category, building_class
+        floor_height_min, floor_height_max, schema_used, building_type = self.get_floor_heights(
+            categories, building_classes
         )
 
         # Calculate floor count using min/max floor heights
@@ -202,44 +511,52 @@ class BuildingFloorAreaEstimator:
         floors_min = height_mean / floor_height_max
         floors_max = height_mean / floor_height_min
 
-        # Use mean of min/max for estimate
-        floors_estimate = (floors_min + floors_max) / 2
-
-        # Round to reasonable values (at least 1 floor)
-        floors_estimate = max(1.0, floors_estimate)
-        floors_rounded = round(floors_estimate)
-
-        # Calculate floor areas
-        area_min = footprint_area * floors_min
-        area_max = footprint_area * floors_max
-        area_estimate = footprint_area * floors_estimate
+        # Use mean of min/max for estimate, at least 1 floor
+        floors_estimate = np.maximum(1.0, (floors_min + floors_max) / 2)
+        floors_rounded = np.rint(np.where(success, floors_estimate, 0)).astype(np.int64)
 
-        # Determine accuracy
-        has_volume = volume is not None and volume > 0
-        has_footprint = footprint_area is not None and footprint_area > 0
-        accuracy = self.determine_accuracy(category, building_class, has_volume, has_footprint)
+        area_estimate = np.where(success, _round(footprint_area * floors_estimate), np.nan)
 
-        # Build result
-        result['area_floor_total_m2'] = round(area_estimate, 2)
-        result['area_floor_above_ground_m2'] = round(area_estimate, 2)  # Same as total (no underground estimate)
-        result['area_accuracy'] = accuracy
-        result['floors_total'] = floors_rounded
-        result['floors_above'] = floors_rounded  # Same as total (no underground estimate)
-        result['floors_accuracy'] = accuracy
-        result['status'] = 'success'
-
-        # Add debug info
-        result['_height_mean_m'] = round(height_mean, 2)
-        result['_floor_height_used'] = round((floor_height_min + floor_height_max) / 2, 2)
-        result['_schema_used'] = schema_used
-        result['_building_type'] = description
-
-        return result
+        # Determine accuracy; failed buildings get no accuracy, schema and type (code -1)
+        accuracy = self.determine_accuracy(
+            categories, building_classes, has_category | has_class, has_volume, has_footprint
+        )
+        accuracy[failed] = -1
+        schema_used[failed] = -1
+        building_type[failed] = None
+
+        results = pd.DataFrame({
+            'id': pd.array(buildings_df['id'].to_numpy(), dtype='Int64'),
+            'area_floor_total_m2': area_estimate,
+            'area_floor_above_ground_m2': area_estimate.copy(),  # Same as total (no underground estimate)
+            'area_accuracy': pd.Categorical.from_codes(accuracy, categories=ACCURACY_LEVELS),
+            'floors_total': pd.arrays.IntegerArray(floors_rounded, failed),
+            'floors_above': pd.arrays.IntegerArray(floors_rounded.copy(), failed.copy()),  # Same as total
+            'floors_accuracy': pd.Categorical.from_codes(accuracy, categories=ACCURACY_LEVELS),
+            'status': pd.Categorical.from_codes(failed.astype(np.int8), categories=RESULT_STATUSES),
+            'error_message': error_message,
+
+            # Debug info
+            '_height_mean_m': np.where(success, _round(height_mean), np.nan),
+            '_floor_height_used': np.where(success, _round((floor_height_min + floor_height_max) / 2), np.nan),
+            '_schema_used': pd.Categorical.from_codes(schema_used, categories=FLOOR_HEIGHT_SCHEMAS),
+            '_building_type': building_type,
+        })
+
+        # Carried along so the written results record the inputs they were calculated from
+        if INPUT_HASH_COLUMN in buildings_df:
+            results[INPUT_HASH_COLUMN] = buildings_df[INPUT_HASH_COLUMN].to_numpy()
+
+        return results
 
     def load_buildings_from_db(self, table_name='public.buildings', building_ids=None,
-                                bbox=None, limit=None, only_with_volume=True):
+                                bbox=None, municipality_nrs=None, limit=None, only_with_volume=True,
+                                incremental=False):
         """
         Load buildings from database that have volume data.
+
+        With incremental, only buildings whose inputs changed since their
+        floor areas were last written are loaded.
         """
         print(f"Loading buildings from {table_name}...")
 
@@ -247,63 +564,298 @@ class BuildingFloorAreaEstimator:
 
         # Build query - select fields needed for floor area calculation
         query = f"""
-            SELECT
-                id,
-                egid,
-                area_footprint_m2,
-                volume_above_ground_m3,
-                height_mean_m,
-                category,
-                class
+            SELECT {_building_select_list()}
             FROM {table_name}
-            WHERE 1=1
         """
 
+        # Restrict to requested IDs through a joined temp table instead of a
+        # literal IN (...) list, so large requeue lists plan like a normal join
+        if building_ids:
+            self._stage_building_ids(conn, building_ids)
+            query += " JOIN _selected_building_ids USING (id)"
+
+        query += " WHERE 1=1" + self._building_filters(bbox, municipality_nrs, only_with_volume, incremental)
+
+        if limit:
+            query += f" LIMIT {limit}"
+
+        df = pd.read_sql(query, conn)
+        conn.close()
+
+        print(f"Found {len(df)} {'changed ' if incremental else ''}buildings with volume data")
+        return df
+
+    def _building_filters(self, bbox=None, municipality_nrs=None, only_with_volume=True, incremental=False):
+        """WHERE conditions (each starting with AND) shared by all building queries"""
+        filters = ""
+
         # Only process buildings with volume data
         if only_with_volume:
-            query += " AND volume_above_ground_m3 IS NOT NULL AND volume_above_ground_m3 > 0"
-            query += " AND area_footprint_m2 IS NOT NULL AND area_footprint_m2 > 0"
+            filters += " AND volume_above_ground_m3 IS NOT NULL AND volume_above_ground_m3 > 0"
+            filters += " AND area_footprint_m2 IS NOT NULL AND area_footprint_m2 > 0"
 
         # Add filters
-        if building_ids:
-            ids_str = ','.join(map(str, building_ids))
-            query += f" AND id IN ({ids_str})"
-
         if bbox:
             minlon, minlat, maxlon, maxlat = bbox
-            query += f"""
+            filters += f"""
                 AND ST_Intersects(
                     geog,
                     ST_MakeEnvelope({minlon}, {minlat}, {maxlon}, {maxlat}, 4326)
                 )
             """
 
-        if limit:
-            query += f" LIMIT {limit}"
+        if municipality_nrs:
+            filters += f" AND municipality_nr IN ({_sql_list(municipality_nrs)})"
 
-        df = pd.read_sql(query, conn)
+        # Only buildings whose inputs changed since the last write (or never written)
+        if incremental:
+            filters += f" AND {INPUT_HASH_COLUMN} IS DISTINCT FROM {input_hash_sql()}"
+
+        return filters
+
+    def list_partitions(self, partition_column, table_name='public.buildings', bbox=None,
+                        municipality_nrs=None, only_with_volume=True, incremental=False):
+        """
+        List the values of partition_column with their building counts.
+
+        Returns: list of (value, count), largest partitions first so that
+        concurrent runs do not end waiting on one big partition
+        """
+        conn = self.get_database_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {partition_column}, COUNT(*)
+            FROM {table_name}
+            WHERE 1=1 {self._building_filters(bbox, municipality_nrs, only_with_volume, incremental)}
+            GROUP BY {partition_column}
+            ORDER BY COUNT(*) DESC
+        """)
+        partitions = cursor.fetchall()
+        cursor.close()
         conn.close()
+        return partitions
 
-        print(f"Found {len(df)} buildings with volume data")
-        return df
+    def iter_buildings_from_db(self, conn, partition_column, partition_value, table_name='public.buildings',
+                               bbox=None, municipality_nrs=None, only_with_volume=True, incremental=False,
+                               chunk_size=DEFAULT_RESULT_BATCH_SIZE):
+        """
+        Stream the buildings of one partition through a server-side cursor.
+
+        Only chunk_size rows are held in memory at a time.
+
+        Yields: DataFrames of up to chunk_size buildings
+        """
+        if partition_value is None:
+            condition, params = f"{partition_column} IS NULL", ()
+        else:
+            condition, params = f"{partition_column} = %s", (partition_value,)
+
+        cursor = conn.cursor(name=f"buildings_{partition_column}")
+        cursor.itersize = chunk_size
+        cursor.execute(f"""
+            SELECT {_building_select_list()}
+            FROM {table_name}
+            WHERE {condition} {self._building_filters(bbox, municipality_nrs, only_with_volume, incremental)}
+        """, params)
+
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=BUILDING_COLUMNS + [INPUT_HASH_COLUMN],
+                                                coerce_float=True)
+        finally:
+            cursor.close()
+
+    def process_partition(self, partition_column, partition_value, on_batch, table_name='public.buildings',
+                          bbox=None, municipality_nrs=None, only_with_volume=True, incremental=False,
+                          batch_size=DEFAULT_RESULT_BATCH_SIZE, write_to_db=False,
+                          commit_size=DEFAULT_COMMIT_SIZE):
+        """
+        Stream, calculate and write one partition.
+
+        Uses its own connections (one for the server-side read cursor, one for
+        writing), so several partitions can be processed concurrently. Every
+        results batch is passed to on_batch after it has been written.
+
+        Returns: dict with buildings, db_rows and db_seconds
+        """
+        stats = {'buildings': 0, 'db_rows': 0, 'db_seconds': 0.0}
+        read_conn = self.get_database_connection()
+        write_conn = self.get_database_connection() if write_to_db else None
 
-    def process_buildings(self, buildings_df):
-        """Process all buildings and return results DataFrame"""
-        results = []
+        try:
+            for buildings in self.iter_buildings_from_db(
+                read_conn, partition_column, partition_value, table_name=table_name, bbox=bbox,
+                municipality_nrs=municipality_nrs, only_with_volume=only_with_volume, incremental=incremental,
+                chunk_size=batch_size
+            ):
+                batch = self.calculate_floor_areas(buildings)
+
+                if write_to_db:
+                    write_start = time.time()
+                    stats['db_rows'] += self.write_results_to_db(
+                        batch, table_name=table_name, conn=write_conn, commit_size=commit_size
+                    )
+                    stats['db_seconds'] += time.time() - write_start
+
+                on_batch(batch)
+                stats['buildings'] += len(batch)
+        finally:
+            read_conn.close()
+            if write_conn is not None:
+                write_conn.close()
+
+        return stats
+
+    def _stage_building_ids(self, conn, building_ids):
+        """
+        Load building IDs into a session temp table using COPY.
+
+        The table lives until the connection is closed and is analyzed so the
+        planner knows its size when joining it against the buildings table.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS _selected_building_ids (id bigint PRIMARY KEY)
+        """)
+        cursor.execute("TRUNCATE _selected_building_ids")
+
+        buffer = io.StringIO('\n'.join(str(i) for i in sorted(set(building_ids))))
+        cursor.copy_expert("COPY _selected_building_ids (id) FROM STDIN", buffer)
+        cursor.execute("ANALYZE _selected_building_ids")
+        cursor.close()
+
+        print(f"  Selecting {len(set(building_ids))} building IDs")
+
+    def ensure_input_hash_column(self, conn, table_name='public.buildings'):
+        """Add INPUT_HASH_COLUMN to the buildings table if it does not exist yet"""
+        cursor = conn.cursor()
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {INPUT_HASH_COLUMN} text")
+        conn.commit()
+        cursor.close()
+
+    def install_floor_height_table(self, conn, lookup_table=DEFAULT_LOOKUP_TABLE):
+        """
+        Fill the floor height lookup table in the database from the compiled lookup arrays.
+
+        One row per GKLAS/GKAT code that has floor heights or an accuracy tier,
+        so the SQL path classifies buildings exactly like the NumPy path. The
+        table is created on the first run and refilled in the caller's
+        transaction afterwards, so concurrent readers see either the old or
+        the new rows.
+        """
+        rows = []
+        for schema, lookup in (('GKLAS', GKLAS_LOOKUP), ('GKAT', GKAT_LOOKUP)):
+            for i, tier in enumerate(lookup['accuracy_tier']):
+                floor_height_min = lookup['floor_height_min'][i]
+                if np.isnan(floor_height_min) and tier == ACCURACY_TIER_NONE:
+                    continue
+                has_heights = not np.isnan(floor_height_min)
+                rows.append((
+                    schema,
+                    lookup['first_code'] + i,
+                    float(floor_height_min) if has_heights else None,
+                    float(lookup['floor_height_max'][i]) if has_heights else None,
+                    int(tier),
+                    lookup['description'][i],
+                ))
+
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {lookup_table} (
+                schema text NOT NULL,
+                code integer NOT NULL,
+                floor_height_min double precision,
+                floor_height_max double precision,
+                accuracy_tier smallint NOT NULL,
+                description text,
+                PRIMARY KEY (schema, code)
+            )
+        """)
+        cursor.execute(f"DELETE FROM {lookup_table}")
+        cursor.executemany(f"INSERT INTO {lookup_table} VALUES (%s, %s, %s, %s, %s, %s)", rows)
+        cursor.close()
+
+    def update_floor_areas_in_db(self, table_name='public.buildings', lookup_table=DEFAULT_LOOKUP_TABLE,
+                                 building_ids=None, bbox=None, municipality_nrs=None, incremental=False):
+        """
+        Compute floor areas inside the database with one set-based UPDATE.
+
+        Installs the lookup table and runs build_floor_area_update_sql, so no
+        building data crosses the network. With incremental, only buildings
+        whose inputs changed since their last write are updated.
+
+        Returns: number of updated buildings
+        """
+        conn = self.get_database_connection()
+        self.ensure_input_hash_column(conn, table_name)
+        cursor = conn.cursor()
+
+        self.install_floor_height_table(conn, lookup_table)
+
+        filters = ""
+        if building_ids:
+            self._stage_building_ids(conn, building_ids)
+            filters += " AND b.id IN (SELECT id FROM _selected_building_ids)"
+        if bbox:
+            minlon, minlat, maxlon, maxlat = bbox
+            filters += f" AND ST_Intersects(b.geog, ST_MakeEnvelope({minlon}, {minlat}, {maxlon}, {maxlat}, 4326))"
+        if municipality_nrs:
+            filters += f" AND b.municipality_nr IN ({_sql_list(municipality_nrs)})"
+        if incremental:
+            filters += f" AND b.{INPUT_HASH_COLUMN} IS DISTINCT FROM {input_hash_sql('b')}"
+
+        print(f"Updating floor areas in {table_name}...")
+        cursor.execute(build_floor_area_update_sql(table_name, lookup_table, filters))
+        updated_count = cursor.rowcount
+
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        print(f"Updated {updated_count} buildings in database")
+        return updated_count
+
+    def process_buildings(self, buildings_df, on_batch=None, batch_size=DEFAULT_RESULT_BATCH_SIZE):
+        """
+        Process all buildings.
+
+        Buildings are calculated column-wise in batches of batch_size. If on_batch
+        is given, every results batch is passed to it as a DataFrame and nothing
+        is kept afterwards; otherwise all batches are concatenated and returned
+        as one results DataFrame.
+        """
         total = len(buildings_df)
 
-        for idx, row in buildings_df.iterrows():
-            print(f"Processing building {len(results) + 1}/{total}", end='\r')
-            result = self.calculate_floor_area(row)
-            results.append(result)
+        batches = []
+        for start in range(0, total, batch_size):
+            batch = self.calculate_floor_areas(buildings_df.iloc[start:start + batch_size])
+            (on_batch or batches.append)(batch)
+            print(f"Processing building {start + len(batch)}/{total}", end='\r')
 
         print(f"\nProcessed {total} buildings")
-        return pd.DataFrame(results)
 
-    def write_results_to_db(self, results_df, table_name='public.buildings'):
+        if on_batch is not None:
+            return None
+        if not batches:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.concat(batches, ignore_index=True)
+
+    def write_results_to_db(self, results_df, table_name='public.buildings', conn=None,
+                            commit_size=DEFAULT_COMMIT_SIZE):
         """
         Write calculated floor areas back to database.
 
+        Successful results are staged with COPY into a temp table and applied
+        with one joined UPDATE, committed every commit_size rows. If conn is
+        given it is reused (and left open), so a run streaming many result
+        batches keeps a single connection and temp table. If the results carry
+        INPUT_HASH_COLUMN, it is written as well (the column must exist, see
+        ensure_input_hash_column), also for failed results, whose floor area
+        columns are left unchanged.
+
         Updates:
         - area_floor_total_m2
         - area_floor_above_ground_m2
@@ -311,44 +863,100 @@ class BuildingFloorAreaEstimator:
         - floors_total
         - floors_above
         - floors_accuracy
+        - area_input_hash (if present in results_df, also for failed results)
+
+        Returns: number of updated buildings (successful results)
         """
         print(f"\nWriting results to database table {table_name}...")
+        start_time = time.time()
 
-        conn = self.get_database_connection()
+        own_connection = conn is None
+        if own_connection:
+            conn = self.get_database_connection()
         cursor = conn.cursor()
 
+        # Emptied automatically at every commit
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS _floor_area_results (
+                id bigint PRIMARY KEY,
+                area_floor_total_m2 numeric,
+                area_floor_above_ground_m2 numeric,
+                area_accuracy text,
+                floors_total integer,
+                floors_above integer,
+                floors_accuracy text,
+                {INPUT_HASH_COLUMN} text
+            ) ON COMMIT DELETE ROWS
+        """)
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS _floor_area_rejected (
+                id bigint PRIMARY KEY,
+                {INPUT_HASH_COLUMN} text
+            ) ON COMMIT DELETE ROWS
+        """)
+
         # Update rows (only successful calculations)
-        successful = results_df[results_df['status'] == 'success']
+        write_hash = INPUT_HASH_COLUMN in results_df
+        columns = DB_RESULT_COLUMNS + ([INPUT_HASH_COLUMN] if write_hash else [])
+        successful = results_df.loc[results_df['status'] == 'success', columns]
+        hash_update = f"{INPUT_HASH_COLUMN} = r.{INPUT_HASH_COLUMN}," if write_hash else ""
         updated_count = 0
 
-        for _, row in successful.iterrows():
+        for start in range(0, len(successful), commit_size):
+            buffer = io.StringIO()
+            successful.iloc[start:start + commit_size].to_csv(buffer, header=False, index=False)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY _floor_area_results ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+
             cursor.execute(f"""
-                UPDATE {table_name}
+                UPDATE {table_name} b
                 SET
-                    area_floor_total_m2 = %s,
-                    area_floor_above_ground_m2 = %s,
-                    area_accuracy = %s,
-                    floors_total = %s,
-                    floors_above = %s,
-                    floors_accuracy = %s,
+                    area_floor_total_m2 = r.area_floor_total_m2,
+                    area_floor_above_ground_m2 = r.area_floor_above_ground_m2,
+                    area_accuracy = r.area_accuracy,
+                    floors_total = r.floors_total,
+                    floors_above = r.floors_above,
+                    floors_accuracy = r.floors_accuracy,
+                    {hash_update}
                     updated_at = NOW()
-                WHERE id = %s
-            """, (
-                row['area_floor_total_m2'],
-                row['area_floor_above_ground_m2'],
-                row['area_accuracy'],
-                row['floors_total'],
-                row['floors_above'],
-                row['floors_accuracy'],
-                row['id']
-            ))
-            updated_count += 1
+                FROM _floor_area_results r
+                WHERE b.id = r.id
+            """)
+            updated_count += cursor.rowcount
+            conn.commit()
+
+        # Failed results only store their input hash, so --incremental skips them
+        # until their inputs change
+        if write_hash:
+            rejected = results_df.loc[results_df['status'] != 'success', ['id', INPUT_HASH_COLUMN]]
+            for start in range(0, len(rejected), commit_size):
+                buffer = io.StringIO()
+                rejected.iloc[start:start + commit_size].to_csv(buffer, header=False, index=False)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY _floor_area_rejected (id, {INPUT_HASH_COLUMN}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+
+                cursor.execute(f"""
+                    UPDATE {table_name} b
+                    SET {INPUT_HASH_COLUMN} = r.{INPUT_HASH_COLUMN}
+                    FROM _floor_area_rejected r
+                    WHERE b.id = r.id
+                """)
+                conn.commit()
 
-        conn.commit()
         cursor.close()
-        conn.close()
+        if own_connection:
+            conn.close()
 
-        print(f"Updated {updated_count} buildings in database")
+        elapsed = time.time() - start_time
+        rate = updated_count / elapsed if elapsed > 0 else 0
+        print(f"Updated {updated_count} buildings in database ({rate:,.0f} rows/s)")
+        return updated_count
 
 
 def main():
@@ -364,23 +972,63 @@ def main():
     parser.add_argument('-b', '--bbox', nargs=4, type=float,
                         metavar=('MINLON', 'MINLAT', 'MAXLON', 'MAXLAT'),
                         help='Bounding box in WGS84 coordinates')
+    parser.add_argument('--municipality', nargs='+', type=int, dest='municipality_nrs',
+                        help='BFS municipality numbers to process')
     parser.add_argument('--building-ids', nargs='+', type=int,
                         help='Process specific building IDs')
+    parser.add_argument('--building-ids-file',
+                        help="File with building IDs to process, one per line ('-' reads from stdin)")
     parser.add_argument('--write-to-db', action='store_true',
                         help='Write results back to database')
     parser.add_argument('--table-name', default='public.buildings',
                         help='Table name (default: public.buildings)')
     parser.add_argument('--include-missing-volume', action='store_true',
                         help='Include buildings without volume data (will fail estimation)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_RESULT_BATCH_SIZE,
+                        help=f'Results buffered before they are flushed to CSV/database (default: {DEFAULT_RESULT_BATCH_SIZE})')
+    parser.add_argument('--commit-size', type=int, default=DEFAULT_COMMIT_SIZE,
+                        help=f'Rows per COPY + UPDATE transaction with --write-to-db (default: {DEFAULT_COMMIT_SIZE})')
+    parser.add_argument('--in-db', action='store_true',
+                        help='Compute floor areas inside the database with one set-based UPDATE (no data transfer)')
+    parser.add_argument('--lookup-table', default=DEFAULT_LOOKUP_TABLE,
+                        help=f'Floor height lookup table installed for --in-db (default: {DEFAULT_LOOKUP_TABLE})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process buildings whose volume, height, footprint or GWR codes changed since the last write')
+
+    parser.add_argument('--partition-by', choices=PARTITION_COLUMNS,
+                        help='Stream the run partition by partition (server-side cursors, bounded memory)')
+    parser.add_argument('--partitions', nargs='+',
+                        help='Only process these partition values (e.g., --partition-by region --partitions ZH)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Partitions processed concurrently, each with its own connections (default: 1)')
 
     args = parser.parse_args()
 
     # Validate that at least one output method is specified
-    if not args.output and not args.write_to_db:
-        print("Error: Must specify either --output for CSV export or --write-to-db for database update",
+    if not args.output and not args.write_to_db and not args.in_db:
+        print("Error: Must specify either --output for CSV export, --write-to-db or --in-db for database update",
+              file=sys.stderr)
+        return 1
+
+    if args.in_db and (args.output or args.limit or args.include_missing_volume):
+        print("Error: --in-db updates the database directly and cannot be combined with "
+              "--output, --limit or --include-missing-volume", file=sys.stderr)
+        return 1
+
+    if args.partition_by and (args.in_db or args.limit or args.building_ids or args.building_ids_file):
+        print("Error: --partition-by cannot be combined with --in-db, --limit or building ID selection",
               file=sys.stderr)
         return 1
 
+    if args.partitions and not args.partition_by:
+        print("Error: --partitions requires --partition-by", file=sys.stderr)
+        return 1
+
+    # The input hash --incremental compares against is only stored by database writes
+    if args.incremental and not (args.write_to_db or args.in_db):
+        print("Error: --incremental requires --write-to-db or --in-db", file=sys.stderr)
+        return 1
+
     # Initialize estimator
     try:
         estimator = BuildingFloorAreaEstimator(args.db_connection)
@@ -388,83 +1036,244 @@ def main():
         print(f"Error connecting to database: {e}", file=sys.stderr)
         return 1
 
-    # Load buildings
-    try:
-        buildings = estimator.load_buildings_from_db(
-            table_name=args.table_name,
-            building_ids=args.building_ids,
-            bbox=args.bbox,
-            limit=args.limit,
-            only_with_volume=not args.include_missing_volume
-        )
-    except Exception as e:
-        print(f"Error loading buildings: {e}", file=sys.stderr)
-        return 1
+    # Collect building IDs from command line and/or file
+    building_ids = list(args.building_ids or [])
+    if args.building_ids_file:
+        try:
+            building_ids.extend(read_building_ids(args.building_ids_file))
+        except Exception as e:
+            print(f"Error reading building IDs: {e}", file=sys.stderr)
+            return 1
+        if not building_ids:
+            print(f"Error: No building IDs found in {args.building_ids_file}", file=sys.stderr)
+            return 1
 
-    if len(buildings) == 0:
-        print("No buildings to process")
+    # Set-based update inside the database
+    if args.in_db:
+        start_time = time.time()
+        try:
+            estimator.update_floor_areas_in_db(
+                table_name=args.table_name,
+                lookup_table=args.lookup_table,
+                building_ids=building_ids,
+                bbox=args.bbox,
+                municipality_nrs=args.municipality_nrs,
+                incremental=args.incremental
+            )
+        except Exception as e:
+            print(f"Error updating floor areas: {e}", file=sys.stderr)
+            return 1
+        print(f"Finished in {time.time() - start_time:.1f} seconds")
         return 0
 
-    # Process buildings
-    results = estimator.process_buildings(buildings)
+    # Written results record their input hash, which --incremental compares against
+    if args.write_to_db:
+        try:
+            conn = estimator.get_database_connection()
+            estimator.ensure_input_hash_column(conn, args.table_name)
+            conn.close()
+        except Exception as e:
+            print(f"Error preparing {INPUT_HASH_COLUMN} column: {e}", file=sys.stderr)
+            return 1
 
-    # Save CSV if output file specified
-    if args.output:
-        # Select columns for CSV output
-        output_cols = [
-            'id', 'area_floor_total_m2', 'area_floor_above_ground_m2', 'area_accuracy',
-            'floors_total', 'floors_above', 'floors_accuracy', 'status', 'error_message',
-            '_height_mean_m', '_floor_height_used', '_schema_used', '_building_type'
-        ]
-        results[output_cols].to_csv(args.output, index=False)
-        print(f"\nResults saved to: {args.output}")
+    # Running totals for the summary, so no full results table is kept.
+    # Only the floor area of successful buildings is collected (for the median).
+    summary = {
+        'total': 0,
+        'successful': 0,
+        'floors_sum': 0,
+        'floors_max': None,
+        'floor_areas': [],
+        'accuracy': {},
+        'schema': {},
+        'errors': {},
+        'db_rows': 0,
+        'db_seconds': 0.0,
+    }
+
+    def count_values(counts, series):
+        for value, count in series.value_counts().items():
+            if count:
+                counts[value] = counts.get(value, 0) + count
+
+    def record_batch(batch):
+        first_batch = summary['total'] == 0
+
+        # Append to CSV if output file specified
+        if args.output:
+            batch.to_csv(args.output, mode='w' if first_batch else 'a', header=first_batch, index=False)
+
+        successful = batch[batch['status'] == 'success']
+        summary['total'] += len(batch)
+        summary['successful'] += len(successful)
+
+        if len(successful) > 0:
+            summary['floor_areas'].append(successful['area_floor_total_m2'].to_numpy(dtype=np.float64))
+            summary['floors_sum'] += int(successful['floors_total'].sum())
+            batch_max = int(successful['floors_total'].max())
+            summary['floors_max'] = max(summary['floors_max'] or batch_max, batch_max)
+            count_values(summary['accuracy'], successful['area_accuracy'])
+            count_values(summary['schema'], successful['_schema_used'])
+
+        count_values(summary['errors'], batch.loc[batch['status'] != 'success', 'error_message'])
+
+    failed_partitions = []
+    if args.partition_by:
+        # Partitioned run: each partition is streamed through a server-side
+        # cursor on its own connections, several partitions at a time
+        try:
+            partitions = estimator.list_partitions(
+                args.partition_by,
+                table_name=args.table_name,
+                bbox=args.bbox,
+                municipality_nrs=args.municipality_nrs,
+                only_with_volume=not args.include_missing_volume,
+                incremental=args.incremental
+            )
+        except Exception as e:
+            print(f"Error listing partitions: {e}", file=sys.stderr)
+            return 1
 
-    # Write to database if requested
-    if args.write_to_db:
+        if args.partitions:
+            selected = set(args.partitions)
+            partitions = [(value, count) for value, count in partitions if str(value) in selected]
+
+        if not partitions:
+            print("No buildings to process")
+            return 0
+
+        print(f"Processing {sum(count for _, count in partitions)} buildings in {len(partitions)} "
+              f"partitions by {args.partition_by} ({args.workers} concurrent)")
+
+        lock = threading.Lock()
+
+        def record_batch_locked(batch):
+            with lock:
+                record_batch(batch)
+
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = {
+                executor.submit(
+                    estimator.process_partition, args.partition_by, value, record_batch_locked,
+                    table_name=args.table_name,
+                    bbox=args.bbox,
+                    municipality_nrs=args.municipality_nrs,
+                    only_with_volume=not args.include_missing_volume,
+                    incremental=args.incremental,
+                    batch_size=args.batch_size,
+                    write_to_db=args.write_to_db,
+                    commit_size=args.commit_size
+                ): value
+                for value, _ in partitions
+            }
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                value = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    print(f"Error processing partition {value}: {e}", file=sys.stderr)
+                    failed_partitions.append(value)
+                    continue
+
+                summary['db_rows'] += stats['db_rows']
+                summary['db_seconds'] += stats['db_seconds']
+                print(f"Partition {value}: {stats['buildings']} buildings ({done}/{len(partitions)})")
+
+        if failed_partitions:
+            print(f"\nFailed partitions ({len(failed_partitions)}): "
+                  f"{' '.join(str(value) for value in failed_partitions)}", file=sys.stderr)
+    else:
+        # Load buildings
         try:
-            estimator.write_results_to_db(results, table_name=args.table_name)
+            buildings = estimator.load_buildings_from_db(
+                table_name=args.table_name,
+                building_ids=building_ids,
+                bbox=args.bbox,
+                municipality_nrs=args.municipality_nrs,
+                limit=args.limit,
+                only_with_volume=not args.include_missing_volume,
+                incremental=args.incremental
+            )
         except Exception as e:
-            print(f"Error writing to database: {e}", file=sys.stderr)
+            print(f"Error loading buildings: {e}", file=sys.stderr)
             return 1
 
+        if len(buildings) == 0:
+            print("No buildings to process")
+            return 0
+
+        db_conn = None
+
+        def handle_batch(batch):
+            # Write to database if requested
+            if args.write_to_db:
+                write_start = time.time()
+                summary['db_rows'] += estimator.write_results_to_db(
+                    batch, table_name=args.table_name, conn=db_conn, commit_size=args.commit_size
+                )
+                summary['db_seconds'] += time.time() - write_start
+
+            record_batch(batch)
+
+        # Process buildings, streaming result batches to CSV and/or database
+        try:
+            # One connection (and staging temp table) for all result batches
+            if args.write_to_db:
+                db_conn = estimator.get_database_connection()
+            estimator.process_buildings(buildings, on_batch=handle_batch, batch_size=args.batch_size)
+        except Exception as e:
+            print(f"Error processing buildings: {e}", file=sys.stderr)
+            return 1
+        finally:
+            if db_conn is not None:
+                db_conn.close()
+
+    if args.output:
+        print(f"\nResults saved to: {args.output}")
+
     # Print summary
     print("\n" + "=" * 50)
     print("SUMMARY")
     print("=" * 50)
 
-    successful = results[results['status'] == 'success']
-    print(f"Successful: {len(successful)}/{len(results)}")
+    successful = summary['successful']
+    print(f"Successful: {successful}/{summary['total']}")
+
+    if args.write_to_db and summary['db_seconds'] > 0:
+        print(f"Database write: {summary['db_rows']} rows in {summary['db_seconds']:.1f} seconds "
+              f"({summary['db_rows'] / summary['db_seconds']:,.0f} rows/s)")
 
-    if len(successful) > 0:
+    if successful > 0:
+        floor_areas = np.concatenate(summary['floor_areas'])
         print(f"\nFloor Area Statistics:")
-        print(f"  Total floor area: {successful['area_floor_total_m2'].sum():,.0f} m²")
-        print(f"  Average floor area: {successful['area_floor_total_m2'].mean():,.0f} m²")
-        print(f"  Median floor area: {successful['area_floor_total_m2'].median():,.0f} m²")
+        print(f"  Total floor area: {floor_areas.sum():,.0f} m²")
+        print(f"  Average floor area: {floor_areas.mean():,.0f} m²")
+        print(f"  Median floor area: {np.median(floor_areas):,.0f} m²")
 
         print(f"\nFloor Count Statistics:")
-        print(f"  Average floors: {successful['floors_total'].mean():.1f}")
-        print(f"  Max floors: {successful['floors_total'].max()}")
+        print(f"  Average floors: {summary['floors_sum'] / successful:.1f}")
+        print(f"  Max floors: {summary['floors_max']}")
 
         print(f"\nAccuracy Distribution:")
-        for acc, count in successful['area_accuracy'].value_counts().items():
-            pct = count / len(successful) * 100
+        for acc, count in sorted(summary['accuracy'].items(), key=lambda item: -item[1]):
+            pct = count / successful * 100
             print(f"  {acc}: {count} ({pct:.1f}%)")
 
         # Schema usage stats
-        if '_schema_used' in successful.columns:
-            print(f"\nClassification Schema Used:")
-            for schema, count in successful['_schema_used'].value_counts().items():
-                pct = count / len(successful) * 100
-                print(f"  {schema}: {count} ({pct:.1f}%)")
+        print(f"\nClassification Schema Used:")
+        for schema, count in sorted(summary['schema'].items(), key=lambda item: -item[1]):
+            pct = count / successful * 100
+            print(f"  {schema}: {count} ({pct:.1f}%)")
 
     # Error breakdown
-    errors = results[results['status'] != 'success']
-    if len(errors) > 0:
-        print(f"\nErrors ({len(errors)}):")
-        for msg, count in errors['error_message'].value_counts().items():
+    errors = summary['total'] - successful
+    if errors > 0:
+        print(f"\nErrors ({errors}):")
+        for msg, count in sorted(summary['errors'].items(), key=lambda item: -item[1]):
             print(f"  {msg}: {count}")
 
-    return 0
+    return 1 if failed_partitions else 0
 
 
 if __name__ == "__main__":
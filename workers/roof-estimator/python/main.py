@@ -15,31 +15,48 @@ Example:
 import os
 import sys
 import time
+import queue
+import threading
 import argparse
+import atexit
 import logging
+import multiprocessing
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
 import pandas as pd
 import fiona
 import numpy as np
 import gc
 import warnings
+from contextlib import nullcontext
 warnings.filterwarnings('ignore')
 
 # Import roof analysis module
-from roof_analysis import analyze_building_roof
+from roof_analysis import analyze_building_roof, analyze_building_roofs_batch
 from green_roof import GreenRoofAnalyzer
 import shapely.geometry
 
 # Processing configuration
 CHUNK_SIZE = 100000  # Process and save every 100,000 buildings
+TASK_SIZE = 250  # Buildings per task sent to a worker process
+TASKS_PER_WORKER = 4  # Tasks queued per worker, so no worker waits for the next task
+PIPELINE_DEPTH = 1  # Chunks read ahead while the current chunk is analyzed (--pipeline)
+
+# Parsed geometry fields added by read_gdb_buildings_chunked, not part of the output
+INTERNAL_FIELDS = ('_vertices', '_faces', '_geometry_type')
 
 # Global analyzer instance for workers
 green_roof_analyzer = None
 
+# GDB layer opened by a worker process for --parallel-read
+worker_collection = None
+
 def worker_init(rs_dir):
     """Initialize the global analyzer in worker processes."""
     global green_roof_analyzer
+    atexit.register(close_worker_collection)
     if rs_dir:
         try:
             green_roof_analyzer = GreenRoofAnalyzer(rs_dir)
@@ -48,6 +65,19 @@ def worker_init(rs_dir):
             logging.error(f"Failed to initialize GreenRoofAnalyzer: {e}")
 
 
+def close_worker_collection():
+    """
+    Close the GDB layer of a worker process before the interpreter shuts down.
+
+    Spawned workers exit through a regular interpreter shutdown, during which
+    an open fiona collection would be torn down after the modules it needs.
+    """
+    global worker_collection
+    if worker_collection is not None:
+        worker_collection.close()
+        worker_collection = None
+
+
 def setup_logging(output_dir):
     """Setup logging configuration with file and console output."""
     log_file = output_dir / 'roof_estimator.log'
@@ -62,6 +92,21 @@ def setup_logging(output_dir):
     return logging.getLogger(__name__)
 
 
+def _ring_coordinates(ring):
+    """
+    Valid coordinates of one ring (without the closing point) as an (n, 3) float64 array.
+
+    Slow path for malformed geometries: coordinates that are not lists or
+    tuples of at least 2 values are skipped, missing Z values become 0.
+    """
+    valid = [
+        (coord[0], coord[1], coord[2] if len(coord) >= 3 else 0.0)
+        for coord in ring[:-1]  # Skip duplicate last point
+        if isinstance(coord, (list, tuple)) and len(coord) >= 2
+    ]
+    return np.array(valid, dtype=np.float64).reshape(-1, 3)
+
+
 def parse_multipatch_geometry(geometry):
     """
     Parse multipatch geometry from GDB into vertices and faces.
@@ -69,89 +114,83 @@ def parse_multipatch_geometry(geometry):
     swissBUILDINGS3D stores 3D building geometries as MultiPolygon/Multipatch
     with 3D coordinates (X, Y, Z in LV95 + elevation).
 
+    All rings are flattened into one contiguous vertex array; the fan
+    triangulation of every ring with at least 3 vertices is generated with
+    array arithmetic instead of one face at a time.
+
     Args:
         geometry: GeoJSON-like geometry dict from fiona
 
     Returns:
-        tuple: (vertices, faces) lists for mesh creation
+        tuple: (vertices, faces) as (n, 3) float64 and (m, 3) int64 arrays
     """
-    vertices = []
-    faces = []
+    empty = (np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.int64))
 
     try:
         if not geometry:
-            return [], []
+            return empty
 
         geom_type = geometry.get('type', '')
         coords = geometry.get('coordinates', [])
 
         if not coords:
-            return [], []
+            return empty
 
-        # Handle MultiPolygon (standard multipatch format)
+        # Handle MultiPolygon (standard multipatch format) and single Polygon
         if geom_type == 'MultiPolygon':
-            for polygon in coords:
-                if not isinstance(polygon, list):
-                    continue
-
-                for ring in polygon:
-                    if not isinstance(ring, list):
-                        continue
-
-                    # Add vertices from this ring
-                    start_idx = len(vertices)
-                    valid_vertices = 0
-
-                    for coord in ring[:-1]:  # Skip duplicate last point
-                        if isinstance(coord, (list, tuple)) and len(coord) >= 2:
-                            if len(coord) >= 3:
-                                vertices.append([float(coord[0]), float(coord[1]), float(coord[2])])
-                            else:
-                                vertices.append([float(coord[0]), float(coord[1]), 0.0])
-                            valid_vertices += 1
-
-                    # Create faces using fan triangulation
-                    if valid_vertices >= 3:
-                        for i in range(1, valid_vertices - 1):
-                            faces.append([
-                                start_idx,
-                                start_idx + i,
-                                start_idx + i + 1
-                            ])
-
-        # Handle single Polygon
-        elif geom_type == 'Polygon':
-            if not isinstance(coords, list):
-                return [], []
-
-            for ring in coords:
-                if not isinstance(ring, list):
-                    continue
-
-                start_idx = len(vertices)
-                valid_vertices = 0
-
-                for coord in ring[:-1]:
-                    if isinstance(coord, (list, tuple)) and len(coord) >= 2:
-                        if len(coord) >= 3:
-                            vertices.append([float(coord[0]), float(coord[1]), float(coord[2])])
-                        else:
-                            vertices.append([float(coord[0]), float(coord[1]), 0.0])
-                        valid_vertices += 1
-
-                if valid_vertices >= 3:
-                    for i in range(1, valid_vertices - 1):
-                        faces.append([
-                            start_idx,
-                            start_idx + i,
-                            start_idx + i + 1
-                        ])
-
-        return vertices, faces
+            polygons = coords
+        elif geom_type == 'Polygon' and isinstance(coords, list):
+            polygons = [coords]
+        else:
+            return empty
+
+        rings = [
+            ring
+            for polygon in polygons if isinstance(polygon, list)
+            for ring in polygon if isinstance(ring, list)
+        ]
+        if not rings:
+            return empty
+
+        # Convert the coordinates of all rings in one NumPy call
+        coordinates = []
+        for ring in rings:
+            coordinates.extend(ring[:-1])  # Skip duplicate last point
+        ring_sizes = np.array([max(len(ring) - 1, 0) for ring in rings], dtype=np.int64)
+
+        try:
+            dimensions = set(map(len, coordinates))
+            if dimensions == {3}:
+                vertices = np.fromiter(chain.from_iterable(coordinates), dtype=np.float64,
+                                       count=3 * len(coordinates)).reshape(-1, 3)
+            elif len(dimensions) == 1 and min(dimensions) >= 2:
+                vertices = np.array(coordinates, dtype=np.float64)[:, :3]
+                if vertices.shape[1] == 2:
+                    vertices = np.column_stack((vertices, np.zeros(len(vertices))))
+            else:
+                vertices = None
+        except (TypeError, ValueError):
+            vertices = None
+
+        if vertices is None:
+            # Mixed or malformed coordinates: validate ring by ring
+            ring_coordinates = [_ring_coordinates(ring) for ring in rings]
+            vertices = np.concatenate(ring_coordinates)
+            ring_sizes = np.array([len(ring) for ring in ring_coordinates], dtype=np.int64)
+
+        ring_starts = np.cumsum(ring_sizes) - ring_sizes
+
+        # Fan triangulation: ring with n vertices -> faces (s, s+i, s+i+1) for i in 1..n-2
+        fan_sizes = np.maximum(ring_sizes - 2, 0)
+        fan_starts = np.repeat(ring_starts, fan_sizes)
+        fan_offsets = np.arange(fan_sizes.sum()) - np.repeat(np.cumsum(fan_sizes) - fan_sizes, fan_sizes) + 1
+        faces = np.column_stack((fan_starts, fan_starts + fan_offsets, fan_starts + fan_offsets + 1))
+
+        return vertices, faces.astype(np.int64, copy=False)
 
     except Exception as e:
         logging.debug(f"Error parsing geometry: {str(e)}")
-        return [], []
+        return empty
 
 
 def list_gdb_layers(gdb_path):
@@ -159,6 +198,46 @@ def list_gdb_layers(gdb_path):
     return fiona.listlayers(gdb_path)
 
 
+def find_gdb_layer(gdb_path, layer_name):
+    """
+    Find a layer in a GDB file by case-insensitive partial name match.
+
+    Returns:
+        str: Actual layer name
+
+    Raises:
+        ValueError: If no layer matches
+    """
+    layers = fiona.listlayers(gdb_path)
+    for layer in layers:
+        if layer_name.lower() in layer.lower() or layer.lower() in layer_name.lower():
+            return layer
+
+    logging.getLogger(__name__).error(f"Layer '{layer_name}' not found. Available: {layers}")
+    raise ValueError(f"Layer not found: {layer_name}")
+
+
+def read_feature_building(feature):
+    """
+    Turn a fiona feature into a building dict: its properties plus the parsed geometry fields.
+
+    Returns:
+        dict: Properties with '_vertices', '_faces' and '_geometry_type'
+    """
+    # Extract properties and geometry
+    properties = dict(feature['properties'])
+    geometry = feature.get('geometry')
+
+    # Parse multipatch geometry
+    vertices, faces = parse_multipatch_geometry(geometry)
+
+    # Store parsed data
+    properties['_vertices'] = vertices
+    properties['_faces'] = faces
+    properties['_geometry_type'] = geometry.get('type') if geometry else None
+    return properties
+
+
 def read_gdb_buildings_chunked(gdb_path, layer_name='Building_solid', chunk_size=CHUNK_SIZE, limit=None, bbox=None):
     """
     Read buildings from GDB file in chunks using Fiona.
@@ -169,7 +248,6 @@ def read_gdb_buildings_chunked(gdb_path, layer_name='Building_solid', chunk_size
         gdb_path: Path to the GDB file
         layer_name: Name of the layer to read (default: Building_solid)
         chunk_size: Number of buildings per chunk
-        chunk_size: Number of buildings per chunk
         limit: Maximum total buildings to read (None for all)
         bbox: Optional (minx, miny, maxx, maxy) to filter features spatially
 
@@ -181,25 +259,15 @@ def read_gdb_buildings_chunked(gdb_path, layer_name='Building_solid', chunk_size
 
     try:
         # List available layers
-        layers = fiona.listlayers(gdb_path)
-        logger.info(f"Available layers: {layers}")
+        logger.info(f"Available layers: {fiona.listlayers(gdb_path)}")
 
         # Find the correct layer name (case-insensitive partial match)
-        actual_layer = None
-        for layer in layers:
-            if layer_name.lower() in layer.lower() or layer.lower() in layer_name.lower():
-                actual_layer = layer
-                break
-
-        if not actual_layer:
-            logger.error(f"Layer '{layer_name}' not found. Available: {layers}")
-            raise ValueError(f"Layer not found: {layer_name}")
-
+        actual_layer = find_gdb_layer(gdb_path, layer_name)
         logger.info(f"Using layer: {actual_layer}")
 
         # Read features in chunks
-        # fiona.open supports bbox filter (if driver supports it, GDB usually does or fiona handles it)
-        with fiona.open(gdb_path, layer=actual_layer, bbox=bbox) as src:
+        # filter(bbox=...) sets an OGR spatial filter, so features outside bbox are never parsed
+        with fiona.open(gdb_path, layer=actual_layer) as src:
             logger.info(f"Layer CRS: {src.crs}")
             logger.info(f"Layer bounds: {src.bounds}")
             logger.info(f"Schema: {src.schema}")
@@ -208,23 +276,11 @@ def read_gdb_buildings_chunked(gdb_path, layer_name='Building_solid', chunk_size
             chunk_num = 0
             total_count = 0
 
-            for feature in src:
+            for feature in src.filter(bbox=bbox):
                 if limit and total_count >= limit:
                     break
 
-                # Extract properties and geometry
-                properties = dict(feature['properties'])
-                geometry = feature.get('geometry')
-
-                # Parse multipatch geometry
-                vertices, faces = parse_multipatch_geometry(geometry)
-
-                # Store parsed data
-                properties['_vertices'] = vertices
-                properties['_faces'] = faces
-                properties['_geometry_type'] = geometry.get('type') if geometry else None
-
-                chunk.append(properties)
+                chunk.append(read_feature_building(feature))
                 total_count += 1
 
                 if total_count % 1000 == 0:
@@ -246,43 +302,167 @@ def read_gdb_buildings_chunked(gdb_path, layer_name='Building_solid', chunk_size
         raise
 
 
-def process_single_building(row_data):
+def prefetch(iterable, depth=PIPELINE_DEPTH):
     """
-    Process a single building - designed for parallel execution.
+    Iterate over iterable in a background thread, keeping up to depth items ready.
+
+    Used to read and parse the next chunk while the current one is analyzed.
+    Exceptions raised by the iterable are re-raised in the consuming thread.
 
     Args:
-        row_data: tuple of (index, building_dict)
+        iterable: Iterable to consume in the background (e.g. read_gdb_buildings_chunked)
+        depth: Maximum number of items waiting in the queue
 
-    Returns:
-        tuple: (index, result_dict)
+    Yields:
+        Items of iterable, in order
     """
-    idx, row = row_data
-    result = dict(row)
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        # Give up once the consumer is gone, instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((done, e))
+        else:
+            put((done, None))
+
+    threading.Thread(target=produce, name='chunk-reader', daemon=True).start()
 
     try:
-        # Get pre-parsed geometry data
-        vertices = row.get('_vertices', [])
-        faces = row.get('_faces', [])
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def count_gdb_features(gdb_path, layer_name='Building_solid', limit=None):
+    """
+    Number of features of a GDB layer, capped at limit.
 
+    Returns:
+        tuple: (actual layer name, feature count)
+    """
+    actual_layer = find_gdb_layer(gdb_path, layer_name)
+    with fiona.open(gdb_path, layer=actual_layer) as src:
+        count = len(src)
+    return actual_layer, min(count, limit) if limit else count
+
+
+def list_gdb_feature_ids(gdb_path, layer, bbox, limit=None):
+    """
+    Sorted feature IDs of a GDB layer intersecting bbox, capped at limit.
+
+    Uses the OGR spatial filter, so no geometry is parsed in Python. Positions
+    in this list are the feature indices of --parallel-read when filtering.
+    """
+    with fiona.open(gdb_path, layer=layer) as src:
+        feature_ids = sorted(src.keys(bbox=bbox))
+    return feature_ids[:limit] if limit else feature_ids
+
+
+def read_and_process_slice(gdb_path, layer, start, stop, bbox=None, fid_range=None):
+    """
+    Read, parse and analyze features [start, stop) of a GDB layer - designed for parallel execution.
+
+    Each worker process opens the GDB once and keeps it open for all its
+    slices, so reading and parsing scale with the number of workers. Only the
+    result dicts (properties and analysis columns, no geometry) are returned.
+
+    Args:
+        gdb_path: Path to the GDB file
+        layer: Actual layer name (see find_gdb_layer)
+        start, stop: Feature index range to read
+        bbox: Optional (minx, miny, maxx, maxy) OGR spatial filter. Feature indices
+            then count the features inside bbox (see list_gdb_feature_ids), and
+            fid_range gives the first and last feature ID of [start, stop)
+
+    Returns:
+        list: (feature index, result dict) for every building read
+    """
+    global worker_collection
+    if worker_collection is None or worker_collection.path != gdb_path or worker_collection.name != layer:
+        if worker_collection is not None:
+            worker_collection.close()
+        worker_collection = fiona.open(gdb_path, layer=layer)
+
+    if bbox:
+        # The spatial filter disables fast positioning by index, so the range
+        # is selected by feature ID; sorted to match list_gdb_feature_ids
+        where = f"FID >= {int(fid_range[0])} AND FID <= {int(fid_range[1])}"
+        features = sorted(worker_collection.items(bbox=bbox, where=where), key=lambda item: item[0])
+    else:
+        features = worker_collection.items(start, stop)
+
+    indices = []
+    buildings = []
+    for index, (_, feature) in enumerate(features, start=start):
+        indices.append(index)
+        buildings.append(read_feature_building(feature))
+
+    results = []
+    for index, building, analysis in zip(indices, buildings,
+                                         process_building_batch(*pack_building_geometries(buildings))):
+        result = {key: value for key, value in building.items() if key not in INTERNAL_FIELDS}
+        result.update(analysis)
+        results.append((index, result))
+    return results
+
+
+def analyze_building_geometry(vertices, faces, roof_result=None):
+    """
+    Run the roof (and, if enabled, green roof) analysis on pre-parsed geometry.
+
+    Args:
+        vertices: (n, 3) float64 vertex array from parse_multipatch_geometry
+        faces: (m, 3) int64 face array from parse_multipatch_geometry
+        roof_result: Roof analysis already computed for this building
+            (see analyze_building_roofs_batch); computed here if None
+
+    Returns:
+        dict: Analysis columns, including analysis_status and analysis_error
+    """
+    result = {}
+
+    try:
         # Validate geometry data types
-        if not isinstance(vertices, list):
+        if not isinstance(vertices, np.ndarray):
             result['analysis_status'] = 'failed'
             result['analysis_error'] = f'Invalid vertices type: {type(vertices).__name__}'
-            return idx, result
+            return result
 
-        if not isinstance(faces, list):
+        if not isinstance(faces, np.ndarray):
             result['analysis_status'] = 'failed'
             result['analysis_error'] = f'Invalid faces type: {type(faces).__name__}'
-            return idx, result
+            return result
 
-        if not vertices or not faces:
+        if len(vertices) == 0 or len(faces) == 0:
             result['analysis_status'] = 'failed'
             result['analysis_error'] = f'Empty geometry: {len(vertices)} vertices, {len(faces)} faces'
-            return idx, result
+            return result
 
         # Perform roof analysis
-        roof_results = analyze_building_roof(vertices, faces)
-        result.update(roof_results)
+        if roof_result is None:
+            roof_result = analyze_building_roof(vertices, faces)
+        result.update(roof_result)
 
         # Perform green roof analysis if available
         if green_roof_analyzer:
@@ -308,7 +488,7 @@ def process_single_building(row_data):
             # Better approach: Modify read_gdb_buildings_chunked to optionally store the validation 2D footprint.
             # For now, let's use the vertices projected to 2D and take the convex hull.
             # It's fast and reasonable for single buildings, though it might overestimate L-shapes.
-            points_2d = [(v[0], v[1]) for v in vertices]
+            points_2d = vertices[:, :2]
             if len(points_2d) >= 3:
                 footprint_geom = shapely.geometry.MultiPoint(points_2d).convex_hull
                 green_results = green_roof_analyzer.calculate_green_area(footprint_geom)
@@ -318,32 +498,176 @@ def process_single_building(row_data):
         result['analysis_status'] = 'failed'
         result['analysis_error'] = str(e)
 
-    # Remove internal fields before returning
-    result.pop('_vertices', None)
-    result.pop('_faces', None)
-    result.pop('_geometry_type', None)
+    return result
+
 
-    return idx, result
+def pack_building_geometries(rows):
+    """
+    Concatenate the parsed geometries of several buildings into flat arrays.
+
+    Building i owns vertices[vertex_offsets[i]:vertex_offsets[i + 1]] and
+    faces[face_offsets[i]:face_offsets[i + 1]]; face indices stay local to
+    their building.
+
+    Returns:
+        tuple: (vertices, vertex_offsets, faces, face_offsets)
+    """
+    vertex_arrays = [row.get('_vertices', np.empty((0, 3))) for row in rows]
+    face_arrays = [row.get('_faces', np.empty((0, 3), dtype=np.int64)) for row in rows]
+
+    vertex_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in vertex_arrays], out=vertex_offsets[1:])
+    face_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(f) for f in face_arrays], out=face_offsets[1:])
+
+    vertices = np.concatenate(vertex_arrays) if rows else np.empty((0, 3))
+    faces = np.concatenate(face_arrays) if rows else np.empty((0, 3), dtype=np.int64)
+    return vertices, vertex_offsets, faces, face_offsets
+
+
+def process_building_batch(vertices, vertex_offsets, faces, face_offsets):
+    """
+    Process a batch of buildings packed by pack_building_geometries - designed for parallel execution.
+
+    Only geometry travels to the worker and only analysis columns travel
+    back; building properties stay in the parent process. The roof analysis
+    of the whole batch runs at once (analyze_building_roofs_batch).
+
+    Returns:
+        list: analysis result dicts, in the order of the packed buildings
+    """
+    roof_results = analyze_building_roofs_batch(vertices, vertex_offsets, faces, face_offsets)
+
+    results = []
+    for i, roof_result in enumerate(roof_results):
+        results.append(analyze_building_geometry(
+            vertices[vertex_offsets[i]:vertex_offsets[i + 1]],
+            faces[face_offsets[i]:face_offsets[i + 1]],
+            roof_result
+        ))
+    return results
+
+
+def default_worker_count():
+    """Default number of parallel workers: CPU count - 1, max 8"""
+    return max(min(os.cpu_count() - 1, 8), 1)
+
+
+class WorkerPool:
+    """
+    Process pool used for analysis, replaced by a new one when a worker dies.
+
+    A worker killed by the OS (e.g. out of memory) breaks a ProcessPoolExecutor
+    for good: its unfinished tasks fail with BrokenProcessPool and every later
+    submit raises it. submit() then starts a new pool, so the run continues
+    with the next task.
+
+    Workers are started with the spawn method rather than fork: a pool may
+    start (or restart) workers while the --pipeline reader thread is inside
+    fiona/GDAL, and a forked child inheriting its locks can deadlock.
+    """
+
+    def __init__(self, num_workers, rs_dir):
+        self.num_workers = num_workers
+        self.rs_dir = rs_dir
+        self.executor = self._start()
+
+    def _start(self):
+        return ProcessPoolExecutor(max_workers=self.num_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=worker_init, initargs=(self.rs_dir,))
+
+    def submit(self, function, *args):
+        try:
+            return self.executor.submit(function, *args)
+        except BrokenProcessPool:
+            logging.getLogger(__name__).warning("A worker process died, starting a new worker pool")
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._start()
+            return self.executor.submit(function, *args)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+
+def create_worker_pool(num_workers=None, rs_dir=None):
+    """
+    Create the process pool used for analysis.
+
+    worker_init runs once per worker process, so a pool reused for all chunks
+    builds GreenRoofAnalyzer (and its raster index) once per worker per run.
+    """
+    return WorkerPool(num_workers or default_worker_count(), rs_dir)
+
+
+def run_tasks(executor, tasks, on_result, on_error, max_pending):
+    """
+    Run tasks on an executor with at most max_pending tasks in flight.
+
+    A new task is submitted whenever one completes, so the pool is kept busy
+    without queueing every task (and its arguments) at once. Tasks lost with
+    a dead worker fail with BrokenProcessPool and are passed to on_error like
+    any other failure; a WorkerPool replaces the broken pool on the next submit.
+
+    Args:
+        executor: Executor to submit to (see create_worker_pool)
+        tasks: Iterable of (key, function, args)
+        on_result: Called as on_result(key, result) for every completed task
+        on_error: Called as on_error(key, exception) for every failed task
+        max_pending: Maximum number of submitted, unfinished tasks
+    """
+    tasks = iter(tasks)
+    pending = {}
+
+    def submit_next_task():
+        task = next(tasks, None)
+        if task is not None:
+            key, function, args = task
+            pending[executor.submit(function, *args)] = key
+
+    for _ in range(max_pending):
+        submit_next_task()
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                on_error(key, e)
+            else:
+                on_result(key, result)
+            submit_next_task()
 
 
-def process_chunk_parallel(chunk_data, chunk_num, num_workers=None, rs_dir=None):
+def process_chunk_parallel(chunk_data, chunk_num, num_workers=None, rs_dir=None, task_size=TASK_SIZE,
+                           executor=None):
     """
     Process a chunk of buildings in parallel using ProcessPoolExecutor.
 
+    Buildings are sent to the workers in tasks of task_size packed geometries,
+    with at most TASKS_PER_WORKER tasks per worker in flight.
+
     Args:
         chunk_data: List of building dicts
         chunk_num: Chunk number for logging
         num_workers: Number of parallel workers (default: CPU count - 1, max 8)
         rs_dir: Directory containing RS imagery for green roof analysis (optional)
+        task_size: Number of buildings per worker task
+        executor: Pool from create_worker_pool to reuse (default: a new pool for this chunk)
 
     Returns:
         dict: Results indexed by building index
     """
     logger = logging.getLogger(__name__)
-
-    if num_workers is None:
-        num_workers = min(os.cpu_count() - 1, 8)
-        num_workers = max(num_workers, 1)
+    num_workers = num_workers or default_worker_count()
 
     logger.info(f"Processing chunk {chunk_num} with {len(chunk_data)} buildings using {num_workers} workers")
 
@@ -351,34 +675,99 @@ def process_chunk_parallel(chunk_data, chunk_num, num_workers=None, rs_dir=None)
     total = len(chunk_data)
     processed = 0
 
-    # Prepare data for parallel processing
-    row_data = [(idx, row) for idx, row in enumerate(chunk_data)]
+    def tasks():
+        for start in range(0, total, task_size):
+            yield start, process_building_batch, pack_building_geometries(chunk_data[start:start + task_size])
 
-    with ProcessPoolExecutor(max_workers=num_workers, initializer=worker_init, initargs=(rs_dir,)) as executor:
-        # Submit all tasks
-        future_to_idx = {
-            executor.submit(process_single_building, data): data[0]
-            for data in row_data
-        }
+    def store_results(start, analysis_results):
+        nonlocal processed
+        for idx, analysis in enumerate(analysis_results, start=start):
+            result = {key: value for key, value in chunk_data[idx].items() if key not in INTERNAL_FIELDS}
+            result.update(analysis)
+            results[idx] = result
 
-        # Process completed tasks
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            try:
-                idx, result = future.result()
-                results[idx] = result
-                processed += 1
+        count = len(analysis_results)
+        if (processed + count) // 1000 > processed // 1000:
+            logger.info(f"Chunk {chunk_num}: Processed {processed + count}/{total} buildings")
+        processed += count
 
-                if processed % 1000 == 0:
-                    logger.info(f"Chunk {chunk_num}: Processed {processed}/{total} buildings")
+    def store_error(start, error):
+        count = min(task_size, total - start)
+        logger.error(f"Error processing buildings {start}-{start + count - 1} in chunk {chunk_num}: {str(error)}")
+        store_results(start, [{'analysis_status': 'failed', 'analysis_error': str(error)}] * count)
 
-            except Exception as e:
-                logger.error(f"Error processing building in chunk {chunk_num}, idx {idx}: {str(e)}")
-                results[idx] = {'analysis_status': 'failed', 'analysis_error': str(e)}
+    with nullcontext(executor) if executor else create_worker_pool(num_workers, rs_dir) as pool:
+        run_tasks(pool, tasks(), store_results, store_error, num_workers * TASKS_PER_WORKER)
 
     return results
 
 
+def process_gdb_slice_parallel(gdb_path, layer, start, stop, chunk_num, num_workers=None, rs_dir=None,
+                               task_size=TASK_SIZE, bbox=None, feature_ids=None, executor=None):
+    """
+    Read and process features [start, stop) of a GDB layer inside the worker processes.
+
+    Unlike process_chunk_parallel, nothing is read in the parent: every task
+    is a feature index range that a worker reads, parses and analyzes itself
+    (see read_and_process_slice).
+
+    Args:
+        gdb_path: Path to the GDB file
+        layer: Actual layer name (see find_gdb_layer)
+        start, stop: Feature index range of the chunk
+        chunk_num: Chunk number for logging
+        num_workers: Number of parallel workers (default: CPU count - 1, max 8)
+        rs_dir: Directory containing RS imagery for green roof analysis (optional)
+        task_size: Number of features per worker task
+        bbox: Optional (minx, miny, maxx, maxy) to filter buildings spatially
+        feature_ids: Feature IDs inside bbox from list_gdb_feature_ids (required with bbox)
+        executor: Pool from create_worker_pool to reuse (default: a new pool for this chunk)
+
+    Returns:
+        dict: Results indexed by feature index; features of a failed task get
+        a row with analysis_status 'failed' and no properties
+    """
+    logger = logging.getLogger(__name__)
+    num_workers = num_workers or default_worker_count()
+
+    logger.info(f"Reading and processing features {start}-{stop - 1} (chunk {chunk_num}) using {num_workers} workers")
+
+    results = {}
+    failed_features = 0
+
+    def tasks():
+        for task_start in range(start, stop, task_size):
+            task_stop = min(task_start + task_size, stop)
+            fid_range = (feature_ids[task_start], feature_ids[task_stop - 1]) if bbox else None
+            yield (task_start, task_stop), read_and_process_slice, (
+                gdb_path, layer, task_start, task_stop, bbox, fid_range
+            )
+
+    def store_results(task_range, slice_results):
+        results.update(slice_results)
+
+    def store_error(task_range, error):
+        nonlocal failed_features
+        failed_features += task_range[1] - task_range[0]
+        logger.error(f"Error reading features {task_range[0]}-{task_range[1] - 1} in chunk {chunk_num}: {str(error)}")
+
+        # The properties of unread features are unknown, so the failed rows name
+        # the feature index instead
+        for index in range(*task_range):
+            results[index] = {
+                'analysis_status': 'failed',
+                'analysis_error': f"Feature {index} could not be read: {str(error)}",
+            }
+
+    with nullcontext(executor) if executor else create_worker_pool(num_workers, rs_dir) as pool:
+        run_tasks(pool, tasks(), store_results, store_error, num_workers * TASKS_PER_WORKER)
+
+    if failed_features:
+        logger.warning(f"Chunk {chunk_num}: {failed_features} features could not be read")
+
+    return dict(sorted(results.items()))
+
+
 def save_chunk_results(results, output_path, chunk_num):
     """
     Save chunk results to CSV file.
@@ -524,6 +913,12 @@ Examples:
                         help='Number of parallel workers (default: CPU count - 1, max 8)')
     parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
                         help=f'Number of buildings per chunk (default: {CHUNK_SIZE})')
+    parser.add_argument('--task-size', type=int, default=TASK_SIZE,
+                        help=f'Number of buildings per worker task (default: {TASK_SIZE})')
+    parser.add_argument('--parallel-read', action='store_true',
+                        help='Read and parse the GDB inside the worker processes (each worker reads its own feature ranges)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Read the next chunk and save the previous one while the current chunk is analyzed')
     parser.add_argument('--list-layers', action='store_true',
                         help='List available layers in GDB and exit')
     parser.add_argument('--keep-chunks', action='store_true',
@@ -569,6 +964,8 @@ Examples:
     logger.info(f"Output: {output_dir}")
     logger.info(f"Layer: {args.layer}")
     logger.info(f"Chunk size: {args.chunk_size}")
+    if args.pipeline:
+        logger.info("Pipeline: reading, analysis and saving of consecutive chunks overlap")
     if args.limit:
         logger.info(f"Limit: {args.limit} buildings")
     if rs_dir:
@@ -604,30 +1001,80 @@ Examples:
             except Exception as e:
                 logging.warning(f"Error determining RS bounds: {e}. Processing all buildings.")
 
-        # Process each chunk
-        for chunk_num, chunk_data in read_gdb_buildings_chunked(
-            str(input_path), args.layer, args.chunk_size, args.limit, bbox=filter_bbox
-        ):
+        def log_chunk_header(chunk_num):
             logger.info(f"\n{'='*40}")
             logger.info(f"Processing chunk {chunk_num}")
             logger.info(f"{'='*40}")
 
-            # Process chunk in parallel
-            results = process_chunk_parallel(chunk_data, chunk_num, args.workers, str(rs_dir) if rs_dir else None)
+        def process_chunks():
+            """Yield (chunk number, results) for every chunk, read in the parent or in the workers"""
+            rs = str(rs_dir) if rs_dir else None
+            num_workers = args.workers or default_worker_count()
+
+            # One pool for the whole run: workers are started and initialized once, not per chunk
+            with create_worker_pool(num_workers, rs) as pool:
+                if args.parallel_read:
+                    layer, feature_count = count_gdb_features(str(input_path), args.layer, args.limit)
+                    feature_ids = None
+                    if filter_bbox:
+                        feature_ids = list_gdb_feature_ids(str(input_path), layer, filter_bbox, args.limit)
+                        feature_count = len(feature_ids)
+                    logger.info(f"Reading {feature_count} features of layer {layer} in the worker processes")
+
+                    for chunk_num, start in enumerate(range(0, feature_count, args.chunk_size)):
+                        log_chunk_header(chunk_num)
+                        yield chunk_num, process_gdb_slice_parallel(
+                            str(input_path), layer, start, min(start + args.chunk_size, feature_count), chunk_num,
+                            num_workers, rs, task_size=args.task_size, bbox=filter_bbox,
+                            feature_ids=feature_ids, executor=pool
+                        )
+                else:
+                    chunks = read_gdb_buildings_chunked(
+                        str(input_path), args.layer, args.chunk_size, args.limit, bbox=filter_bbox
+                    )
+                    if args.pipeline:
+                        chunks = prefetch(chunks)
 
-            # Save chunk results
-            summary = save_chunk_results(results, output_path, chunk_num)
+                    for chunk_num, chunk_data in chunks:
+                        log_chunk_header(chunk_num)
+
+                        # Process chunk in parallel
+                        yield chunk_num, process_chunk_parallel(chunk_data, chunk_num, num_workers, rs,
+                                                                task_size=args.task_size, executor=pool)
+
+                        del chunk_data
+
+        def record_summary(summary):
             chunk_summaries.append(summary)
 
             # Log chunk summary
-            logger.info(f"Chunk {chunk_num} complete: {summary['successful']}/{summary['total']} successful")
+            logger.info(f"Chunk {summary['chunk_num']} complete: {summary['successful']}/{summary['total']} successful")
             if summary['roof_shapes']:
                 logger.info(f"Roof shapes: {summary['roof_shapes']}")
 
-            # Force garbage collection
-            del chunk_data
-            del results
-            gc.collect()
+        # Process each chunk
+        if args.pipeline:
+            # Chunk N-1 is written by a background thread while chunk N is analyzed
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending_save = None
+                for chunk_num, results in process_chunks():
+                    if pending_save is not None:
+                        record_summary(pending_save.result())
+                    pending_save = writer.submit(save_chunk_results, results, output_path, chunk_num)
+
+                    del results
+                    gc.collect()
+
+                if pending_save is not None:
+                    record_summary(pending_save.result())
+        else:
+            for chunk_num, results in process_chunks():
+                # Save chunk results
+                record_summary(save_chunk_results(results, output_path, chunk_num))
+
+                # Force garbage collection
+                del results
+                gc.collect()
 
         # Merge all chunks into final output
         if chunk_summaries:
@@ -5,9 +5,7 @@ and classifies roof shapes based on surface geometry.
 """
 
 import numpy as np
-import trimesh
 import logging
-from collections import defaultdict
 
 # Roof shape classification constants
 ROOF_SHAPES = {
@@ -20,6 +18,61 @@ ROOF_SHAPES = {
     'unknown': 'Unable to classify roof shape'
 }
 
+# Faces whose cross product norm is below this are degenerate (zero normal), as in trimesh
+DEGENERATE_FACE_TOLERANCE = float(np.finfo(np.float64).resolution * 100)
+
+
+def compute_mesh_metrics(vertices, faces):
+    """
+    Compute per-face and whole-mesh metrics of a triangle mesh with NumPy.
+
+    Uses the same formulas as trimesh (zero normals for degenerate faces),
+    without building a trimesh.Trimesh. Faces that reference non-finite
+    vertices are dropped, as trimesh's remove_infinite_values does.
+
+    Args:
+        vertices: (n, 3) array of vertex coordinates
+        faces: (m, 3) array of vertex indices
+
+    Returns:
+        dict: 'face_normals' (m, 3), 'face_areas' (m,), 'face_centroids' (m, 3),
+        'total_area', and 'min_z'/'max_z' of the vertices used by faces
+        (None if no face is left)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+
+    triangles = vertices[faces]
+    finite = np.isfinite(triangles).all(axis=(1, 2))
+    if not finite.all():
+        triangles = triangles[finite]
+
+    face_normals, face_areas, face_centroids = _triangle_metrics(triangles)
+    triangle_z = triangles[:, :, 2]
+
+    return {
+        'face_normals': face_normals,
+        'face_areas': face_areas,
+        'face_centroids': face_centroids,
+        'total_area': face_areas.sum(),
+        'min_z': triangle_z.min() if len(triangles) else None,
+        'max_z': triangle_z.max() if len(triangles) else None,
+    }
+
+
+def _triangle_metrics(triangles):
+    """Unit normals (zero for degenerate faces), areas and centroids of (m, 3, 3) triangles"""
+    edges = triangles[:, 1:, :] - triangles[:, :2, :]
+    crosses = np.cross(edges[:, 0], edges[:, 1])
+
+    norms = np.sqrt(np.dot(crosses * crosses, [1.0, 1.0, 1.0]))
+    valid = norms > DEGENERATE_FACE_TOLERANCE
+    face_normals = np.zeros_like(crosses)
+    face_normals[valid] = crosses[valid] * np.reciprocal(norms[valid]).reshape((-1, 1))
+
+    face_areas = np.sqrt((crosses ** 2).sum(axis=1)) / 2.0
+    return face_normals, face_areas, triangles.mean(axis=1)
+
 
 def classify_face_orientation(normal_z, horizontal_tolerance=10.0, vertical_tolerance=10.0):
     """
@@ -51,17 +104,39 @@ def classify_face_orientation(normal_z, horizontal_tolerance=10.0, vertical_tole
         return 'sloped'
 
 
+def classify_face_orientations(normal_z, horizontal_tolerance=10.0, vertical_tolerance=10.0):
+    """
+    Array version of classify_face_orientation.
+
+    Args:
+        normal_z: (m,) array of face normal Z components
+        horizontal_tolerance: Angle tolerance in degrees for horizontal classification
+        vertical_tolerance: Angle tolerance in degrees for vertical classification
+
+    Returns:
+        tuple: (horizontal, vertical, sloped) boolean masks; horizontal covers
+        both 'horizontal_up' and 'horizontal_down'
+    """
+    abs_z = np.abs(normal_z)
+
+    horizontal = abs_z > np.cos(np.radians(horizontal_tolerance))
+    vertical = ~horizontal & (abs_z < np.sin(np.radians(vertical_tolerance)))
+    sloped = ~(horizontal | vertical)
+    return horizontal, vertical, sloped
+
+
 def get_face_slope_angle(normal):
     """
     Calculate the slope angle of a face from horizontal.
 
     Args:
-        normal: 3D normal vector [x, y, z]
+        normal: 3D normal vector [x, y, z], or (m, 3) array of normals
 
     Returns:
-        float: Slope angle in degrees (0 = horizontal, 90 = vertical)
+        float or array: Slope angle in degrees (0 = horizontal, 90 = vertical)
     """
-    return np.degrees(np.arccos(abs(normal[2])))
+    normal = np.asarray(normal)
+    return np.degrees(np.arccos(np.abs(normal[..., 2])))
 
 
 def get_face_azimuth(normal):
@@ -69,15 +144,21 @@ def get_face_azimuth(normal):
     Calculate the azimuth (compass direction) a sloped face is facing.
 
     Args:
-        normal: 3D normal vector [x, y, z]
+        normal: 3D normal vector [x, y, z], or (m, 3) array of normals
 
     Returns:
-        float: Azimuth in degrees (0 = North, 90 = East, etc.)
+        float or array: Azimuth in degrees (0 = North, 90 = East, etc.)
     """
-    azimuth = np.degrees(np.arctan2(normal[0], normal[1]))
-    if azimuth < 0:
-        azimuth += 360
-    return azimuth
+    normal = np.asarray(normal)
+    azimuth = np.degrees(np.arctan2(normal[..., 0], normal[..., 1]))
+    if np.ndim(azimuth) == 0:
+        return azimuth + 360 if azimuth < 0 else azimuth
+    return np.where(azimuth < 0, azimuth + 360, azimuth)
+
+
+def _running_sum(values):
+    """Sum of an array in index order, equal to accumulating it in a Python loop"""
+    return np.cumsum(values)[-1] if len(values) else 0.0
 
 
 def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, footprint_area):
@@ -90,6 +171,83 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
         building_height: Total building height in meters
         footprint_area: Building footprint area in m²
 
+    Returns:
+        dict: Roof classification with shape, confidence, and details
+    """
+    return classify_roof_shape_arrays(
+        [f['area'] for f in sloped_faces],
+        [f['slope'] for f in sloped_faces],
+        [f['azimuth'] for f in sloped_faces],
+        [f['area'] for f in horizontal_roof_faces],
+        building_height,
+        footprint_area
+    )
+
+
+def classify_roof_shape_arrays(sloped_areas, sloped_slopes, sloped_azimuths, horizontal_roof_areas,
+                               building_height, footprint_area):
+    """
+    Classify the roof shape from parallel arrays of sloped and horizontal roof faces.
+
+    Same rules as classify_roof_shape. Sector areas and area-weighted slopes
+    and azimuths are computed with np.bincount instead of per-group lists.
+
+    Args:
+        sloped_areas: (k,) areas of the sloped roof faces
+        sloped_slopes: (k,) slope angles in degrees
+        sloped_azimuths: (k,) azimuths in degrees
+        horizontal_roof_areas: (h,) areas of the horizontal roof faces
+        building_height: Total building height in meters
+        footprint_area: Building footprint area in m²
+
+    Returns:
+        dict: Roof classification with shape, confidence, and details
+    """
+    sloped_areas = np.asarray(sloped_areas, dtype=np.float64)
+    sloped_slopes = np.asarray(sloped_slopes, dtype=np.float64)
+    sloped_azimuths = np.asarray(sloped_azimuths, dtype=np.float64)
+    horizontal_roof_areas = np.asarray(horizontal_roof_areas, dtype=np.float64)
+
+    # Group sloped faces by azimuth (compass direction) into 45-degree sectors
+    sectors = _azimuth_sectors(sloped_azimuths)
+    sector_first_face = np.full(8, len(sectors))
+    np.minimum.at(sector_first_face, sectors, np.arange(len(sectors)))
+
+    return _classify_roof_sectors(
+        _running_sum(sloped_areas),
+        _running_sum(horizontal_roof_areas),
+        len(sloped_areas),
+        len(horizontal_roof_areas),
+        np.mean(sloped_slopes) if len(sloped_slopes) else 0.0,
+        np.bincount(sectors, weights=sloped_areas, minlength=8),
+        np.bincount(sectors, weights=sloped_areas * sloped_slopes, minlength=8),
+        np.bincount(sectors, weights=sloped_areas * sloped_azimuths, minlength=8),
+        sector_first_face
+    )
+
+
+def _azimuth_sectors(azimuths):
+    """45-degree azimuth sector (0 = North, 1 = North-East, ...) of each face"""
+    return ((azimuths + 22.5) / 45).astype(np.intp) % 8
+
+
+def _classify_roof_sectors(total_sloped_area, total_horizontal_roof_area, sloped_face_count,
+                           horizontal_face_count, mean_slope, sector_areas, sector_slopes,
+                           sector_azimuths, sector_first_face):
+    """
+    Apply the roof shape rules to the per-sector statistics of one building.
+
+    Args:
+        total_sloped_area: Area of the sloped roof faces
+        total_horizontal_roof_area: Area of the horizontal roof faces
+        sloped_face_count: Number of sloped roof faces
+        horizontal_face_count: Number of horizontal roof faces
+        mean_slope: Unweighted mean slope of the sloped roof faces
+        sector_areas: (8,) sloped roof area per azimuth sector
+        sector_slopes: (8,) area-weighted slope sums per sector
+        sector_azimuths: (8,) area-weighted azimuth sums per sector
+        sector_first_face: (8,) index of the first face in each sector, orders equal areas
+
     Returns:
         dict: Roof classification with shape, confidence, and details
     """
@@ -103,14 +261,12 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
         'roof_face_count': 0
     }
 
-    total_sloped_area = sum(f['area'] for f in sloped_faces)
-    total_horizontal_roof_area = sum(f['area'] for f in horizontal_roof_faces)
     total_roof_area = total_sloped_area + total_horizontal_roof_area
 
     if total_roof_area == 0:
         return result
 
-    result['roof_face_count'] = len(sloped_faces) + len(horizontal_roof_faces)
+    result['roof_face_count'] = sloped_face_count + horizontal_face_count
 
     # Calculate ratio of flat vs sloped roof
     flat_ratio = total_horizontal_roof_area / total_roof_area if total_roof_area > 0 else 0
@@ -119,52 +275,34 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
     if flat_ratio > 0.85:
         result['roof_shape'] = 'flat'
         result['roof_shape_confidence'] = min(flat_ratio, 1.0)
-        if sloped_faces:
-            result['roof_slope_primary_deg'] = np.mean([f['slope'] for f in sloped_faces])
-        else:
-            result['roof_slope_primary_deg'] = 0.0
+        result['roof_slope_primary_deg'] = mean_slope
         return result
 
     # Analyze sloped faces for roof type classification
-    if not sloped_faces:
+    if sloped_face_count == 0:
         result['roof_shape'] = 'flat'
         result['roof_shape_confidence'] = 1.0
         result['roof_slope_primary_deg'] = 0.0
         return result
 
-    # Group sloped faces by azimuth (compass direction)
-    azimuth_groups = defaultdict(list)
-    for face in sloped_faces:
-        # Group into 45-degree sectors
-        sector = int((face['azimuth'] + 22.5) / 45) % 8
-        azimuth_groups[sector].append(face)
-
-    # Count significant azimuth groups (groups with substantial area)
-    significant_groups = []
-    for sector, faces in azimuth_groups.items():
-        group_area = sum(f['area'] for f in faces)
-        if group_area > 0.1 * total_sloped_area:  # More than 10% of sloped area
-            avg_slope = np.average([f['slope'] for f in faces], weights=[f['area'] for f in faces])
-            avg_azimuth = np.average([f['azimuth'] for f in faces], weights=[f['area'] for f in faces])
-            significant_groups.append({
-                'sector': sector,
-                'area': group_area,
-                'avg_slope': avg_slope,
-                'avg_azimuth': avg_azimuth,
-                'face_count': len(faces)
-            })
-
-    # Sort by area (largest first)
-    significant_groups.sort(key=lambda x: x['area'], reverse=True)
-    num_groups = len(significant_groups)
+    # Significant azimuth groups: more than 10% of sloped area
+    groups = np.flatnonzero(sector_areas > 0.1 * total_sloped_area)
+
+    # Sort by area (largest first), equal areas in order of their first face
+    groups = groups[np.lexsort((sector_first_face[groups], -sector_areas[groups]))]
+
+    group_areas = sector_areas[groups]
+    group_slopes = sector_slopes[groups] / group_areas
+    group_azimuths = sector_azimuths[groups] / group_areas
+    num_groups = len(groups)
 
     # Set primary slope info
-    if significant_groups:
-        result['roof_slope_primary_deg'] = significant_groups[0]['avg_slope']
-        result['roof_azimuth_primary_deg'] = significant_groups[0]['avg_azimuth']
+    if num_groups:
+        result['roof_slope_primary_deg'] = group_slopes[0]
+        result['roof_azimuth_primary_deg'] = group_azimuths[0]
 
-    if len(significant_groups) > 1:
-        result['roof_slope_secondary_deg'] = significant_groups[1]['avg_slope']
+    if num_groups > 1:
+        result['roof_slope_secondary_deg'] = group_slopes[1]
 
     # SHED ROOF: One dominant slope direction
     if num_groups == 1:
@@ -175,7 +313,7 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
     # GABLE ROOF: Two opposite slope directions
     if num_groups == 2:
         # Check if the two groups are roughly opposite (180 degrees apart)
-        azimuth_diff = abs(significant_groups[0]['avg_azimuth'] - significant_groups[1]['avg_azimuth'])
+        azimuth_diff = abs(group_azimuths[0] - group_azimuths[1])
         if azimuth_diff > 180:
             azimuth_diff = 360 - azimuth_diff
 
@@ -183,18 +321,14 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
             result['roof_shape'] = 'gable'
             result['roof_shape_confidence'] = 0.85
             # Ridge orientation is perpendicular to the slope directions
-            ridge_azimuth = (significant_groups[0]['avg_azimuth'] + 90) % 360
+            ridge_azimuth = (group_azimuths[0] + 90) % 360
             result['roof_ridge_orientation'] = ridge_azimuth
             return result
 
     # HIP ROOF: Four slope directions (or three for half-hip)
     if num_groups >= 3:
-        # Check if slopes are distributed around the building
-        sectors_used = set(g['sector'] for g in significant_groups)
-
         # Check for roughly equal distribution
-        areas = [g['area'] for g in significant_groups]
-        area_variance = np.std(areas) / np.mean(areas) if np.mean(areas) > 0 else 1
+        area_variance = np.std(group_areas) / np.mean(group_areas) if np.mean(group_areas) > 0 else 1
 
         if num_groups >= 4 and area_variance < 0.5:
             result['roof_shape'] = 'hip'
@@ -202,8 +336,7 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
             return result
 
         # Check for mansard (steep lower slopes, flatter upper)
-        slopes = [g['avg_slope'] for g in significant_groups]
-        if max(slopes) > 60 and min(slopes) < 40:
+        if group_slopes.max() > 60 and group_slopes.min() < 40:
             result['roof_shape'] = 'mansard'
             result['roof_shape_confidence'] = 0.7
             return result
@@ -220,18 +353,9 @@ def classify_roof_shape(sloped_faces, horizontal_roof_faces, building_height, fo
     return result
 
 
-def analyze_building_roof(vertices, faces):
-    """
-    Analyze building mesh to extract roof characteristics.
-
-    Args:
-        vertices: List of [x, y, z] vertex coordinates
-        faces: List of [v0, v1, v2] face indices
-
-    Returns:
-        dict: Analysis results including areas and roof shape classification
-    """
-    result = {
+def _empty_roof_result():
+    """Result dict of analyze_building_roof with all columns set to None"""
+    return {
         # Area measurements
         'roof_area_m2': None,
         'wall_area_m2': None,
@@ -267,96 +391,86 @@ def analyze_building_roof(vertices, faces):
         'analysis_error': None
     }
 
+
+def _store_roof_classification(result, roof_classification):
+    """Round and store the roof shape columns of one building"""
+    result['roof_shape'] = roof_classification['roof_shape']
+    result['roof_shape_confidence'] = round(roof_classification['roof_shape_confidence'], 2)
+    result['roof_face_count'] = roof_classification['roof_face_count']
+
+    if roof_classification['roof_slope_primary_deg'] is not None:
+        result['roof_slope_primary_deg'] = round(roof_classification['roof_slope_primary_deg'], 1)
+    if roof_classification['roof_slope_secondary_deg'] is not None:
+        result['roof_slope_secondary_deg'] = round(roof_classification['roof_slope_secondary_deg'], 1)
+    if roof_classification['roof_azimuth_primary_deg'] is not None:
+        result['roof_azimuth_primary_deg'] = round(roof_classification['roof_azimuth_primary_deg'], 1)
+    if roof_classification['roof_ridge_orientation'] is not None:
+        result['roof_ridge_orientation'] = round(roof_classification['roof_ridge_orientation'], 1)
+
+
+def analyze_building_roof(vertices, faces):
+    """
+    Analyze building mesh to extract roof characteristics.
+
+    Args:
+        vertices: (n, 3) array or list of [x, y, z] vertex coordinates
+        faces: (m, 3) array or list of [v0, v1, v2] face indices
+
+    Returns:
+        dict: Analysis results including areas and roof shape classification
+    """
+    result = _empty_roof_result()
+
     try:
         # Validate input
-        if not vertices or not faces:
+        if len(vertices) == 0 or len(faces) == 0:
             result['analysis_status'] = 'failed'
             result['analysis_error'] = 'No vertices or faces provided'
             return result
 
-        # Create trimesh from vertices and faces
-        mesh = trimesh.Trimesh(
-            vertices=np.array(vertices),
-            faces=np.array(faces),
-            process=True  # Merge duplicate vertices
-        )
-
         # Get mesh properties
-        face_normals = mesh.face_normals
-        face_areas = mesh.area_faces
-        face_centroids = mesh.triangles_center
-
-        # Initialize area accumulators
-        roof_horizontal_area = 0.0
-        roof_sloped_area = 0.0
-        footprint_area = 0.0
-        wall_area = 0.0
-
-        # Initialize face collections for classification
-        horizontal_faces = []
-        vertical_faces = []
-        sloped_faces = []
-
-        horizontal_roof_faces = []
-        sloped_roof_faces = []
-
-        # Classify each face
-        for i, (normal, area, centroid) in enumerate(zip(face_normals, face_areas, face_centroids)):
-            orientation = classify_face_orientation(normal[2])
-            slope_angle = get_face_slope_angle(normal)
-            azimuth = get_face_azimuth(normal)
-
-            face_info = {
-                'index': i,
-                'area': area,
-                'z': centroid[2],
-                'normal': normal,
-                'slope': slope_angle,
-                'azimuth': azimuth
-            }
-
-            if orientation in ['horizontal_up', 'horizontal_down']:
-                horizontal_faces.append(face_info)
-            elif orientation == 'vertical':
-                vertical_faces.append(face_info)
-                wall_area += area
-            else:  # sloped
-                sloped_faces.append(face_info)
+        mesh = compute_mesh_metrics(vertices, faces)
+        face_normals = mesh['face_normals']
+        face_areas = mesh['face_areas']
+        face_z = mesh['face_centroids'][:, 2]
+
+        # Classify all faces at once
+        horizontal, vertical, sloped = classify_face_orientations(face_normals[:, 2])
+        face_slopes = get_face_slope_angle(face_normals)
+        face_azimuths = get_face_azimuth(face_normals)
+
+        wall_area = _running_sum(face_areas[vertical])
 
         # Separate horizontal faces into roof and footprint based on Z position
-        if horizontal_faces:
-            z_values = [f['z'] for f in horizontal_faces]
-            min_z = min(z_values)
-            max_z = max(z_values)
+        horizontal_z = face_z[horizontal]
+        if len(horizontal_z):
+            min_z = horizontal_z.min()
+            max_z = horizontal_z.max()
             z_range = max_z - min_z
 
             # Footprint threshold: faces in the bottom 10% of Z range
             footprint_threshold = min_z + 0.1 * z_range if z_range > 0.01 else min_z + 0.1
 
-            for face in horizontal_faces:
-                if face['z'] <= footprint_threshold:
-                    footprint_area += face['area']
-                else:
-                    roof_horizontal_area += face['area']
-                    horizontal_roof_faces.append(face)
+            horizontal_roof = horizontal & ~(face_z <= footprint_threshold)
+            footprint_area = _running_sum(face_areas[horizontal & ~horizontal_roof])
+            roof_horizontal_area = _running_sum(face_areas[horizontal_roof])
 
-        # Sloped faces above footprint level are roof surfaces
-        if horizontal_faces:
-            z_values = [f['z'] for f in horizontal_faces]
-            footprint_z = min(z_values)
+            footprint_z = min_z
         else:
-            footprint_z = min(f['z'] for f in sloped_faces) if sloped_faces else 0
+            horizontal_roof = horizontal
+            footprint_area = 0.0
+            roof_horizontal_area = 0.0
+
+            footprint_z = face_z[sloped].min() if sloped.any() else 0
 
-        for face in sloped_faces:
-            if face['z'] > footprint_z + 0.5:  # Above ground level
-                roof_sloped_area += face['area']
-                sloped_roof_faces.append(face)
+        # Sloped faces above footprint level are roof surfaces
+        sloped_roof = sloped & (face_z > footprint_z + 0.5)  # Above ground level
+        roof_sloped_area = _running_sum(face_areas[sloped_roof])
 
         # Calculate building height metrics
-        if len(mesh.vertices) > 0:
-            z_coords = mesh.vertices[:, 2]
-            min_elevation = float(np.min(z_coords))
-            max_elevation = float(np.max(z_coords))
+        if mesh['min_z'] is not None:
+            min_elevation = float(mesh['min_z'])
+            max_elevation = float(mesh['max_z'])
             building_height = max_elevation - min_elevation
 
             result['min_elevation_m'] = round(min_elevation, 2)
@@ -365,8 +479,8 @@ def analyze_building_roof(vertices, faces):
             result['ridge_height_m'] = round(max_elevation, 2)
 
             # Estimate eave height (height where walls meet roof)
-            if wall_area > 0 and vertical_faces:
-                wall_top_z = max(f['z'] for f in vertical_faces)
+            if wall_area > 0 and vertical.any():
+                wall_top_z = face_z[vertical].max()
                 result['eave_height_m'] = round(wall_top_z - min_elevation, 2)
 
             # Estimate wall perimeter from wall area and height
@@ -380,33 +494,23 @@ def analyze_building_roof(vertices, faces):
         result['sloped_roof_area_m2'] = round(roof_sloped_area, 2)
         result['wall_area_m2'] = round(wall_area, 2)
         result['footprint_area_m2'] = round(footprint_area, 2)
-        result['total_surface_area_m2'] = round(float(mesh.area), 2)
+        result['total_surface_area_m2'] = round(float(mesh['total_area']), 2)
 
         # Store face counts
-        result['horizontal_face_count'] = len(horizontal_faces)
-        result['vertical_face_count'] = len(vertical_faces)
-        result['sloped_face_count'] = len(sloped_faces)
+        result['horizontal_face_count'] = int(np.count_nonzero(horizontal))
+        result['vertical_face_count'] = int(np.count_nonzero(vertical))
+        result['sloped_face_count'] = int(np.count_nonzero(sloped))
 
         # Classify roof shape
-        roof_classification = classify_roof_shape(
-            sloped_roof_faces,
-            horizontal_roof_faces,
+        roof_classification = classify_roof_shape_arrays(
+            face_areas[sloped_roof],
+            face_slopes[sloped_roof],
+            face_azimuths[sloped_roof],
+            face_areas[horizontal_roof],
             result['building_height_m'] or 0,
             result['footprint_area_m2'] or 0
         )
-
-        result['roof_shape'] = roof_classification['roof_shape']
-        result['roof_shape_confidence'] = round(roof_classification['roof_shape_confidence'], 2)
-        result['roof_face_count'] = roof_classification['roof_face_count']
-
-        if roof_classification['roof_slope_primary_deg'] is not None:
-            result['roof_slope_primary_deg'] = round(roof_classification['roof_slope_primary_deg'], 1)
-        if roof_classification['roof_slope_secondary_deg'] is not None:
-            result['roof_slope_secondary_deg'] = round(roof_classification['roof_slope_secondary_deg'], 1)
-        if roof_classification['roof_azimuth_primary_deg'] is not None:
-            result['roof_azimuth_primary_deg'] = round(roof_classification['roof_azimuth_primary_deg'], 1)
-        if roof_classification['roof_ridge_orientation'] is not None:
-            result['roof_ridge_orientation'] = round(roof_classification['roof_ridge_orientation'], 1)
+        _store_roof_classification(result, roof_classification)
 
         result['analysis_status'] = 'success'
 
@@ -416,3 +520,209 @@ def analyze_building_roof(vertices, faces):
         logging.debug(f"Roof analysis error: {str(e)}")
 
     return result
+
+
+def _segment_reduce(ufunc, values, segments, num_segments):
+    """
+    Reduce values per segment with ufunc.reduceat.
+
+    values must be grouped by segment (segments non-decreasing). Empty
+    segments get 0; check the returned counts.
+
+    Returns:
+        tuple: (reduced values, counts), both (num_segments,)
+    """
+    counts = np.bincount(segments, minlength=num_segments)
+    reduced = np.zeros(num_segments)
+    nonempty = counts > 0
+    if nonempty.any():
+        starts = np.cumsum(counts) - counts
+        reduced[nonempty] = ufunc.reduceat(values, starts[nonempty])
+    return reduced, counts
+
+
+def analyze_building_roofs_batch(vertices, vertex_offsets, faces, face_offsets):
+    """
+    Analyze many buildings at once from concatenated (CSR-style) mesh arrays.
+
+    Building i owns vertices[vertex_offsets[i]:vertex_offsets[i + 1]] and
+    faces[face_offsets[i]:face_offsets[i + 1]], with face indices local to the
+    building. Normals, areas and orientation classes are computed for all
+    faces in one pass; per-building sums are reduced with np.bincount (in face
+    order, as analyze_building_roof sums them) and extremes with
+    ufunc.reduceat. Only rounding and the roof shape rules run per building.
+
+    Empty buildings and buildings with out-of-range face indices or
+    non-finite vertices are passed to analyze_building_roof one by one.
+
+    Returns:
+        list: One analyze_building_roof result dict per building
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    vertex_offsets = np.asarray(vertex_offsets, dtype=np.int64)
+    face_offsets = np.asarray(face_offsets, dtype=np.int64)
+    num_buildings = len(vertex_offsets) - 1
+
+    def analyze_one(i):
+        return analyze_building_roof(
+            vertices[vertex_offsets[i]:vertex_offsets[i + 1]],
+            faces[face_offsets[i]:face_offsets[i + 1]]
+        )
+
+    try:
+        vertex_counts = np.diff(vertex_offsets)
+        face_counts = np.diff(face_offsets)
+        face_building = np.repeat(np.arange(num_buildings), face_counts)
+
+        # Buildings left to analyze_building_roof
+        in_range = ((faces >= 0) & (faces < vertex_counts[face_building, None])).all(axis=1)
+        batch = (vertex_counts > 0) & (face_counts > 0)
+        batch &= np.bincount(face_building[~in_range], minlength=num_buildings) == 0
+
+        keep = batch[face_building]
+        face_building = face_building[keep]
+        triangles = vertices[faces[keep] + vertex_offsets[face_building, None]]
+
+        finite = np.isfinite(triangles).all(axis=(1, 2))
+        if not finite.all():
+            batch &= np.bincount(face_building[~finite], minlength=num_buildings) == 0
+            keep = batch[face_building]
+            face_building = face_building[keep]
+            triangles = triangles[keep]
+
+        # Per-face metrics and classes for all buildings
+        face_normals, face_areas, face_centroids = _triangle_metrics(triangles)
+        face_z = face_centroids[:, 2]
+
+        horizontal, vertical, sloped = classify_face_orientations(face_normals[:, 2])
+        face_slopes = get_face_slope_angle(face_normals)
+        face_azimuths = get_face_azimuth(face_normals)
+
+        def building_sum(values, mask):
+            return np.bincount(face_building[mask], weights=values[mask], minlength=num_buildings)
+
+        def building_reduce(ufunc, values, mask):
+            return _segment_reduce(ufunc, values[mask], face_building[mask], num_buildings)
+
+        all_faces = np.ones(len(face_building), dtype=bool)
+
+        wall_area = building_sum(face_areas, vertical)
+        wall_top_z, vertical_count = building_reduce(np.maximum, face_z, vertical)
+
+        # Separate horizontal faces into roof and footprint based on Z position
+        horizontal_min_z, horizontal_count = building_reduce(np.minimum, face_z, horizontal)
+        horizontal_max_z, _ = building_reduce(np.maximum, face_z, horizontal)
+        z_range = horizontal_max_z - horizontal_min_z
+        footprint_threshold = np.where(z_range > 0.01, horizontal_min_z + 0.1 * z_range, horizontal_min_z + 0.1)
+
+        horizontal_roof = horizontal & ~(face_z <= footprint_threshold[face_building])
+        footprint_area = building_sum(face_areas, horizontal & ~horizontal_roof)
+        roof_horizontal_area = building_sum(face_areas, horizontal_roof)
+
+        # Sloped faces above footprint level are roof surfaces
+        sloped_min_z, sloped_count = building_reduce(np.minimum, face_z, sloped)
+        footprint_z = np.where(horizontal_count > 0, horizontal_min_z, np.where(sloped_count > 0, sloped_min_z, 0))
+        sloped_roof = sloped & (face_z > footprint_z[face_building] + 0.5)
+        roof_sloped_area = building_sum(face_areas, sloped_roof)
+
+        min_z, _ = building_reduce(np.minimum, triangles[:, :, 2].min(axis=1), all_faces)
+        max_z, _ = building_reduce(np.maximum, triangles[:, :, 2].max(axis=1), all_faces)
+        total_area = building_sum(face_areas, all_faces)
+
+        # Roof sector statistics of all buildings, 8 sectors per building
+        roof_building = face_building[sloped_roof]
+        roof_areas = face_areas[sloped_roof]
+        roof_slopes = face_slopes[sloped_roof]
+        roof_azimuths = face_azimuths[sloped_roof]
+        sector_keys = roof_building * 8 + _azimuth_sectors(roof_azimuths)
+
+        def sector_sum(weights):
+            return np.bincount(sector_keys, weights=weights, minlength=8 * num_buildings).reshape(-1, 8)
+
+        sector_areas = sector_sum(roof_areas)
+        sector_slopes = sector_sum(roof_areas * roof_slopes)
+        sector_azimuths = sector_sum(roof_areas * roof_azimuths)
+        sector_first_face = np.full(8 * num_buildings, len(sector_keys))
+        used_keys, first_faces = np.unique(sector_keys, return_index=True)
+        sector_first_face[used_keys] = first_faces
+        sector_first_face = sector_first_face.reshape(-1, 8)
+
+        sloped_roof_count = np.bincount(roof_building, minlength=num_buildings)
+        sloped_roof_slope_sum = np.bincount(roof_building, weights=roof_slopes, minlength=num_buildings)
+        horizontal_roof_count = np.bincount(face_building[horizontal_roof], minlength=num_buildings)
+
+        # Output columns, rounded like analyze_building_roof: np.round where it
+        # rounds NumPy values, Python round (per building) where it rounds floats
+        building_height = max_z - min_z
+        with np.errstate(divide='ignore', invalid='ignore'):
+            eave_height = np.round(wall_top_z - min_z, 2)
+            wall_perimeter = np.round(wall_area / building_height, 2)
+        has_eave = (wall_area > 0) & (vertical_count > 0)
+        has_perimeter = (wall_area > 0) & (building_height > 0)
+
+        roof_area_column = np.round(roof_horizontal_area + roof_sloped_area, 2)
+        flat_roof_area_column = np.round(roof_horizontal_area, 2)
+        sloped_roof_area_column = np.round(roof_sloped_area, 2)
+        wall_area_column = np.round(wall_area, 2)
+        footprint_area_column = np.round(footprint_area, 2)
+
+        min_elevation = min_z.tolist()
+        max_elevation = max_z.tolist()
+        building_height = building_height.tolist()
+        total_area = total_area.tolist()
+
+    except Exception as e:
+        logging.debug(f"Batch roof analysis error, analyzing buildings one by one: {str(e)}")
+        return [analyze_one(i) for i in range(num_buildings)]
+
+    results = []
+    for i in range(num_buildings):
+        if not batch[i]:
+            results.append(analyze_one(i))
+            continue
+
+        result = _empty_roof_result()
+        try:
+            result['min_elevation_m'] = round(min_elevation[i], 2)
+            result['max_elevation_m'] = round(max_elevation[i], 2)
+            result['building_height_m'] = round(building_height[i], 2)
+            result['ridge_height_m'] = round(max_elevation[i], 2)
+            if has_eave[i]:
+                result['eave_height_m'] = eave_height[i]
+            if has_perimeter[i]:
+                result['wall_perimeter_m'] = wall_perimeter[i]
+
+            result['roof_area_m2'] = roof_area_column[i]
+            result['flat_roof_area_m2'] = flat_roof_area_column[i]
+            result['sloped_roof_area_m2'] = sloped_roof_area_column[i]
+            result['wall_area_m2'] = wall_area_column[i]
+            result['footprint_area_m2'] = footprint_area_column[i]
+            result['total_surface_area_m2'] = round(total_area[i], 2)
+
+            result['horizontal_face_count'] = int(horizontal_count[i])
+            result['vertical_face_count'] = int(vertical_count[i])
+            result['sloped_face_count'] = int(sloped_count[i])
+
+            _store_roof_classification(result, _classify_roof_sectors(
+                roof_sloped_area[i],
+                roof_horizontal_area[i],
+                int(sloped_roof_count[i]),
+                int(horizontal_roof_count[i]),
+                sloped_roof_slope_sum[i] / sloped_roof_count[i] if sloped_roof_count[i] else 0.0,
+                sector_areas[i],
+                sector_slopes[i],
+                sector_azimuths[i],
+                sector_first_face[i]
+            ))
+
+            result['analysis_status'] = 'success'
+
+        except Exception as e:
+            result['analysis_status'] = 'failed'
+            result['analysis_error'] = str(e)
+            logging.debug(f"Roof analysis error: {str(e)}")
+
+        results.append(result)
+
+    return results
@@ -5,26 +5,224 @@ Uses swissALTI3D and swissSURFACE3D to calculate building volumes from PostGIS/S
 """
 
 import argparse
+import io
+import itertools
+import math
 import sys
 from pathlib import Path
 import psycopg2
 import geopandas as gpd
 import rasterio
+from rasterio.transform import rowcol
+from rasterio.windows import Window
 import numpy as np
-from shapely.geometry import Point, Polygon
+import shapely
+from shapely.geometry import Polygon
 from shapely import wkt
 from shapely.affinity import rotate, translate
 import pandas as pd
 from pyproj import Transformer
+from result_cache import ResultCache, make_cache_key
 import warnings
 warnings.filterwarnings('ignore')
 
+# Candidate grid points per block (~0.5 MB per float64 coordinate/height array)
+DEFAULT_BLOCK_SIZE = 65536
+
+# Grid spacing (m) of the regular calculation and of the --quick estimate
+FULL_RESOLUTION = 1.0
+QUICK_RESOLUTION = 5.0
+
+# Quick mode error bands: footprint size classes (m²), percentile of the
+# relative volume error on the calibration subset, and minimum samples per class
+QUICK_SIZE_CLASSES = [0, 100, 500, 2000, np.inf]
+QUICK_ERROR_PERCENTILE = 90
+QUICK_MIN_CLASS_SAMPLES = 5
+
+# Footprints smaller than this many coarse grid cells are cheap enough to
+# calculate at full resolution, where a coarse grid would be badly biased
+QUICK_MIN_CELLS = 25
+
+# Result columns as accumulated by ResultBuffer, status stored as categorical code
+RESULT_STATUSES = ['success', 'no_grid_points', 'no_height_data', 'error']
+RESULT_COLUMNS = [
+    ('id', 'int'),
+    ('egid', 'object'),
+    ('volume_m3', 'float'),
+    ('footprint_area_m2', 'float'),
+    ('mean_height_m', 'float'),
+    ('max_height_m', 'float'),
+    ('base_height_m', 'float'),
+    ('grid_points_count', 'int'),
+    ('status', RESULT_STATUSES),
+]
+QUICK_RESULT_COLUMNS = [
+    ('resolution_m', 'float'),
+    ('volume_error_m3', 'float'),
+]
+
+# Rows per result batch handed to the output sinks
+DEFAULT_RESULT_BATCH_SIZE = 10000
+DEFAULT_CALIBRATION_SIZE = 200
+
+def index_tile_directory(directory):
+    """
+    Scan directory and build a tile ID -> filepath mapping
+
+    Extracts tile IDs dynamically from filenames, making the system robust
+    to different years and naming variations.
+
+    Expected filename formats:
+    - swissalti3d_YYYY_XXXX-YYYY_0.5_2056_5728.tif
+    - swisssurface3d-raster_YYYY_XXXX-YYYY_0.5_2056_5728.tif
+
+    Where:
+    - YYYY = year (e.g., 2019, 2023, 2025)
+    - XXXX-YYYY = tile ID (e.g., 2609-1176)
+
+    The tile ID is always at index 2 when split by underscore.
+    """
+    directory = Path(directory)
+    tile_index = {}
+
+    if not directory.exists():
+        print(f"Warning: Directory not found: {directory}", file=sys.stderr)
+        return tile_index
+
+    # Scan all .tif files in directory
+    for filepath in directory.glob("*.tif"):
+        try:
+            # Split filename by underscore to extract components
+            parts = filepath.stem.split('_')
+
+            if len(parts) >= 3:
+                # Extract tile ID from position 2
+                tile_id = parts[2]
+
+                # Validate tile ID format (should be XXXX-YYYY)
+                if '-' in tile_id and len(tile_id.split('-')) == 2:
+                    tile_index[tile_id] = filepath
+                else:
+                    print(f"Warning: Unexpected tile ID format in {filepath.name}", file=sys.stderr)
+
+        except Exception as e:
+            print(f"Warning: Could not parse tile from {filepath.name}: {e}", file=sys.stderr)
+
+    return tile_index
+
+
+class ResultBuffer:
+    """
+    Columnar accumulator for per-building results
+
+    Results are written into preallocated typed NumPy column buffers instead of
+    a list of dicts; status-like columns are stored as small integer codes into
+    a fixed list of categories. Every batch_size rows the batch is turned into a
+    DataFrame and handed to on_flush, so memory stays proportional to the batch
+    size rather than to the run size.
+
+    columns: list of (name, kind) where kind is 'float', 'int', 'object' or a
+    list of category values.
+    """
+
+    def __init__(self, columns, batch_size, on_flush):
+        self.columns = columns
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.count = 0
+        self.total = 0
+
+        self.buffers = {}
+        self.missing = {}
+        self.codes = {}
+        for name, kind in columns:
+            if kind == 'float':
+                self.buffers[name] = np.empty(batch_size, dtype=np.float64)
+            elif kind == 'int':
+                self.buffers[name] = np.zeros(batch_size, dtype=np.int64)
+                self.missing[name] = np.zeros(batch_size, dtype=bool)
+            elif kind == 'object':
+                self.buffers[name] = np.empty(batch_size, dtype=object)
+            else:
+                self.buffers[name] = np.empty(batch_size, dtype=np.int8)
+                self.codes[name] = {category: code for code, category in enumerate(kind)}
+
+    def append(self, result):
+        """Store one result dict, flushing when the batch is full"""
+        i = self.count
+        for name, kind in self.columns:
+            value = result.get(name)
+            if kind == 'float':
+                self.buffers[name][i] = np.nan if value is None else value
+            elif kind == 'int':
+                self.missing[name][i] = value is None
+                self.buffers[name][i] = 0 if value is None else value
+            elif kind == 'object':
+                self.buffers[name][i] = value
+            else:
+                self.buffers[name][i] = self.codes[name].get(value, -1)
+
+        self.count += 1
+        if self.count >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered rows to on_flush as a DataFrame and reset the buffer"""
+        n = self.count
+        if n == 0:
+            return
+
+        data = {}
+        for name, kind in self.columns:
+            values = self.buffers[name][:n].copy()
+            if kind == 'int':
+                data[name] = pd.arrays.IntegerArray(values, self.missing[name][:n].copy())
+            elif kind in ('float', 'object'):
+                data[name] = values
+            else:
+                data[name] = pd.Categorical.from_codes(values, categories=kind)
+
+        self.count = 0
+        self.total += n
+        self.on_flush(pd.DataFrame(data))
+
+
+def read_building_ids(path):
+    """
+    Read building IDs from a file, or from stdin if path is '-'
+
+    IDs may be separated by newlines, commas or whitespace. Lines starting
+    with '#' are ignored.
+    """
+    stream = sys.stdin if path == '-' else open(path)
+    try:
+        building_ids = []
+        for line in stream:
+            line = line.split('#', 1)[0]
+            building_ids.extend(int(token) for token in line.replace(',', ' ').split())
+        return building_ids
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
 class BuildingVolumeCalculator:
     def __init__(self, db_connection, alti3d_dir, surface3d_dir):
         self.db_connection = db_connection
         self.alti3d_dir = Path(alti3d_dir)
         self.surface3d_dir = Path(surface3d_dir)
-        self.voxel_size = 1.0
+        self.voxel_size = FULL_RESOLUTION
+
+        # Maximum number of candidate grid points held in memory per building;
+        # larger footprints are processed in blocks with streamed reductions
+        self.block_size = DEFAULT_BLOCK_SIZE
+
+        # Relative error bands per footprint size class, set by calibrate_quick_mode
+        self.quick_error_model = None
+
+        # Optional persistent result cache (see result_cache.py)
+        self.result_cache = None
+        self.tile_identities = {}
 
         # Coordinate transformer from WGS84 to LV95
         self.transformer_to_lv95 = Transformer.from_crs("EPSG:4326", "EPSG:2056", always_xy=True)
@@ -40,56 +238,21 @@ class BuildingVolumeCalculator:
         print(f"  Found {len(self.surface3d_tiles)} swissSURFACE3D tiles")
 
     def _index_tiles(self, directory):
-        """
-        Scan directory and build a tile ID -> filepath mapping
-
-        Extracts tile IDs dynamically from filenames, making the system robust
-        to different years and naming variations.
-
-        Expected filename formats:
-        - swissalti3d_YYYY_XXXX-YYYY_0.5_2056_5728.tif
-        - swisssurface3d-raster_YYYY_XXXX-YYYY_0.5_2056_5728.tif
-
-        Where:
-        - YYYY = year (e.g., 2019, 2023, 2025)
-        - XXXX-YYYY = tile ID (e.g., 2609-1176)
-
-        The tile ID is always at index 2 when split by underscore.
-        """
-        tile_index = {}
-
-        if not directory.exists():
-            print(f"Warning: Directory not found: {directory}", file=sys.stderr)
-            return tile_index
-
-        # Scan all .tif files in directory
-        for filepath in directory.glob("*.tif"):
-            try:
-                # Split filename by underscore to extract components
-                parts = filepath.stem.split('_')
-
-                if len(parts) >= 3:
-                    # Extract tile ID from position 2
-                    tile_id = parts[2]
-
-                    # Validate tile ID format (should be XXXX-YYYY)
-                    if '-' in tile_id and len(tile_id.split('-')) == 2:
-                        tile_index[tile_id] = filepath
-                    else:
-                        print(f"Warning: Unexpected tile ID format in {filepath.name}", file=sys.stderr)
-
-            except Exception as e:
-                print(f"Warning: Could not parse tile from {filepath.name}: {e}", file=sys.stderr)
-
-        return tile_index
+        """Scan directory and build a tile ID -> filepath mapping"""
+        return index_tile_directory(directory)
 
     def get_database_connection(self):
         """Create a database connection"""
         return psycopg2.connect(self.db_connection)
 
     def load_buildings_from_db(self, table_name='public.buildings', geom_column='geog',
-                                bbox=None, building_ids=None, limit=None):
-        """Load building footprints from PostGIS database"""
+                                bbox=None, building_ids=None, limit=None, extra_columns=()):
+        """
+        Load building footprints from PostGIS database
+
+        extra_columns are selected in the same query and kept as attributes
+        (e.g. GWR classification for a combined volume and floor area run).
+        """
         print(f"Loading buildings from {table_name}...")
 
         conn = self.get_database_connection()
@@ -97,16 +260,19 @@ class BuildingVolumeCalculator:
         # Build query
         # Cast geography to geometry for proper WKT output
         query = f"""
-            SELECT id, egid, ST_AsText({geom_column}::geometry) as geom_wkt
+            SELECT id, egid, {''.join(f'{column}, ' for column in extra_columns)}ST_AsText({geom_column}::geometry) as geom_wkt
             FROM {table_name}
-            WHERE {geom_column} IS NOT NULL
         """
 
-        # Add filters
+        # Restrict to requested IDs through a joined temp table instead of a
+        # literal IN (...) list, so large requeue lists plan like a normal join
         if building_ids:
-            ids_str = ','.join(map(str, building_ids))
-            query += f" AND id IN ({ids_str})"
+            self._stage_building_ids(conn, building_ids)
+            query += " JOIN _selected_building_ids USING (id)"
+
+        query += f" WHERE {geom_column} IS NOT NULL"
 
+        # Add filters
         if bbox:
             # bbox is in WGS84 (lon, lat)
             minlon, minlat, maxlon, maxlat = bbox
@@ -139,6 +305,26 @@ class BuildingVolumeCalculator:
 
         return gdf
 
+    def _stage_building_ids(self, conn, building_ids):
+        """
+        Load building IDs into a session temp table using COPY
+
+        The table lives until the connection is closed and is analyzed so the
+        planner knows its size when joining it against the buildings table.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS _selected_building_ids (id bigint PRIMARY KEY)
+        """)
+        cursor.execute("TRUNCATE _selected_building_ids")
+
+        buffer = io.StringIO('\n'.join(str(i) for i in sorted(set(building_ids))))
+        cursor.copy_expert("COPY _selected_building_ids (id) FROM STDIN", buffer)
+        cursor.execute("ANALYZE _selected_building_ids")
+        cursor.close()
+
+        print(f"  Selecting {len(set(building_ids))} building IDs")
+
     def get_tile_id_from_point(self, x, y):
         """
         Calculate tile ID from LV95 coordinates
@@ -206,18 +392,12 @@ class BuildingVolumeCalculator:
         longest_idx = np.argmax(edge_lengths)
         return angles[longest_idx]
 
-    def create_aligned_grid_points(self, polygon):
+    def _aligned_grid_frame(self, polygon):
         """
-        Create 1x1m grid points aligned to building orientation
-
-        This improves coverage and accuracy for non-axis-aligned buildings by:
-        1. Rotating the building to align with axes
-        2. Generating a regular grid in rotated space
-        3. Rotating the grid points back to original orientation
+        Set up the rotated grid for a building footprint
 
-        This ensures better grid coverage compared to a fixed axis-aligned grid,
-        especially for diagonal buildings where many grid points would fall outside
-        the footprint with a standard grid.
+        Returns: (rotation_angle, rotated_polygon, x_coords, y_coords) where the
+        coordinates are the 1D axes of the candidate grid in rotated space.
         """
         # Get building orientation angle from minimum area bounding rectangle
         rotation_angle = self.get_building_orientation(polygon)
@@ -232,80 +412,300 @@ class BuildingVolumeCalculator:
         x_max = np.ceil(bounds[2] / self.voxel_size) * self.voxel_size
         y_max = np.ceil(bounds[3] / self.voxel_size) * self.voxel_size
 
-        # Generate grid in rotated space
+        # Generate grid axes in rotated space
         x_coords = np.arange(x_min + self.voxel_size/2, x_max, self.voxel_size)
         y_coords = np.arange(y_min + self.voxel_size/2, y_max, self.voxel_size)
 
-        # Create points and filter by rotated polygon
-        rotated_points = []
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if rotated_polygon.contains(point) or rotated_polygon.touches(point):
-                    rotated_points.append(point)
+        return rotation_angle, rotated_polygon, x_coords, y_coords
+
+    def iter_aligned_grid_blocks(self, polygon, block_size=None):
+        """
+        Yield grid points aligned to building orientation in fixed-size blocks
+
+        The candidate grid (x_coords × y_coords in rotated space) is walked in
+        slices of at most block_size candidates, so memory per block is bounded
+        regardless of footprint size. Each yielded block is an (n, 2) array of
+        LV95 coordinates; blocks with no point inside the footprint are skipped.
+        Concatenating all blocks gives the same points, in the same order, as
+        create_aligned_grid_points.
+        """
+        rotation_angle, rotated_polygon, x_coords, y_coords = self._aligned_grid_frame(polygon)
+        shapely.prepare(rotated_polygon)
+
+        # Rotation back around the rotated polygon's centroid, same affine
+        # parameters as shapely.affinity.rotate
+        angle = np.radians(rotation_angle)
+        cosp, sinp = np.cos(angle), np.sin(angle)
+        if abs(cosp) < 2.5e-16:
+            cosp = 0.0
+        if abs(sinp) < 2.5e-16:
+            sinp = 0.0
+        origin = rotated_polygon.centroid
+        x0, y0 = origin.x, origin.y
+        xoff = x0 - x0 * cosp + y0 * sinp
+        yoff = y0 - x0 * sinp - y0 * cosp
+
+        n_y = len(y_coords)
+        n_candidates = len(x_coords) * n_y
+        block_size = block_size or max(n_candidates, 1)
+
+        for start in range(0, n_candidates, block_size):
+            idx = np.arange(start, min(start + block_size, n_candidates))
+            xs = x_coords[idx // n_y]
+            ys = y_coords[idx % n_y]
+
+            # A point is kept if it is inside or on the boundary (contains or touches)
+            inside = shapely.intersects_xy(rotated_polygon, xs, ys)
+            if not inside.any():
+                continue
+
+            xs = xs[inside]
+            ys = ys[inside]
+            yield np.column_stack((cosp * xs - sinp * ys + xoff,
+                                   sinp * xs + cosp * ys + yoff))
+
+    def create_aligned_grid_points(self, polygon):
+        """
+        Create 1x1m grid points aligned to building orientation
+
+        This improves coverage and accuracy for non-axis-aligned buildings by:
+        1. Rotating the building to align with axes
+        2. Generating a regular grid in rotated space
+        3. Rotating the grid points back to original orientation
 
-        if len(rotated_points) == 0:
+        This ensures better grid coverage compared to a fixed axis-aligned grid,
+        especially for diagonal buildings where many grid points would fall outside
+        the footprint with a standard grid.
+        """
+        blocks = list(self.iter_aligned_grid_blocks(polygon))
+        if not blocks:
             return []
+        return [tuple(point) for point in np.concatenate(blocks)]
+
+    def get_tile_source(self, tile_id, model_type):
+        """Open a tile raster (cached), returns None if the tile is not available"""
+        # Check cache first
+        cache_key = f"{model_type}_{tile_id}"
+
+        if cache_key not in self.tile_cache:
+            tile_path = self.get_tile_path(tile_id, model_type)
+
+            if tile_path is None:
+                return None
+
+            try:
+                self.tile_cache[cache_key] = rasterio.open(tile_path)
+            except Exception as e:
+                print(f"Warning: Could not open {tile_path}: {e}", file=sys.stderr)
+                return None
+
+        return self.tile_cache[cache_key]
+
+    def read_window_values(self, src, xs, ys):
+        """
+        Read raster values at points through a single window read
+
+        The window covers the pixel extent of all given points, so one read
+        replaces one sample per point. Points outside the raster and nodata
+        pixels are returned as NaN.
+        """
+        values = np.full(len(xs), np.nan)
+
+        rows, cols = rowcol(src.transform, xs, ys)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        inside = (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+        if not inside.any():
+            return values
 
-        # Rotate points back to original orientation
-        original_points = []
-        for point in rotated_points:
-            # Rotate back around the rotated polygon's centroid
-            rotated_back = rotate(point, rotation_angle, origin=rotated_polygon.centroid)
-            original_points.append((rotated_back.x, rotated_back.y))
+        rows = rows[inside]
+        cols = cols[inside]
+        row_off, col_off = rows.min(), cols.min()
+        window = Window(col_off, row_off, cols.max() - col_off + 1, rows.max() - row_off + 1)
 
-        return original_points
+        data = src.read(1, window=window).astype(np.float64)
+        if src.nodata is not None:
+            data[data == src.nodata] = np.nan
 
-    def sample_heights_from_tiles(self, points, tiles, model_type):
-        """Sample height values from raster tiles"""
-        heights = np.full(len(points), np.nan)
+        values[inside] = data[rows - row_off, cols - col_off]
+        return values
+
+    def sample_paired_heights(self, points, tiles):
+        """
+        Sample terrain and surface heights for the same points in one pass
+
+        Tiles are resolved once per building: each point is assigned to its tile
+        (same 1 km grid as get_tile_id_from_point) and the matching windows of the
+        swissALTI3D and swissSURFACE3D rasters are read together.
+
+        Returns: (heights, valid_mask) where heights is a (2, n) array with
+        terrain heights in row 0 and surface heights in row 1, and valid_mask
+        marks points where both models have data.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        heights = np.full((2, len(points)), np.nan)
+
+        point_tile_x = (xs / 1000).astype(np.int64)
+        point_tile_y = (ys / 1000).astype(np.int64)
 
         for tile_id in tiles:
-            # Check cache first
-            cache_key = f"{model_type}_{tile_id}"
+            tile_x, tile_y = (int(part) for part in tile_id.split('-'))
+            in_tile = (point_tile_x == tile_x) & (point_tile_y == tile_y)
+
+            if not in_tile.any():
+                continue
 
-            if cache_key not in self.tile_cache:
-                tile_path = self.get_tile_path(tile_id, model_type)
+            for row, model_type in enumerate(('alti3d', 'surface3d')):
+                src = self.get_tile_source(tile_id, model_type)
 
-                if tile_path is None:
+                if src is None:
                     continue
 
                 try:
-                    self.tile_cache[cache_key] = rasterio.open(tile_path)
+                    heights[row, in_tile] = self.read_window_values(src, xs[in_tile], ys[in_tile])
                 except Exception as e:
-                    print(f"Warning: Could not open {tile_path}: {e}", file=sys.stderr)
+                    print(f"Warning: Error reading {model_type} window from {tile_id}: {e}", file=sys.stderr)
+
+        valid_mask = ~np.isnan(heights).any(axis=0)
+        return heights, valid_mask
+
+    def reduce_block_heights(self, polygon, tiles):
+        """
+        Sample the grid point blocks of a footprint and reduce them to volume statistics
+
+        Returns None if there are no grid points, otherwise
+        (grid_points_count, valid_count, base_height, height_sum, height_max)
+        where heights are measured above base_height and clamped at 0.
+
+        The base is the minimum terrain height over all blocks, so footprints
+        with more than one block are sampled twice: the first pass finds the
+        base, the second re-samples each block and reduces its heights above
+        the base. At most one block is held in memory, and height_sum is the
+        exactly rounded sum (math.fsum) of all heights, so the statistics do
+        not depend on the block size.
+        """
+        grid_points_count = 0
+        block_count = 0
+        base_height = None
+        first_surface = None
+
+        for block in self.iter_aligned_grid_blocks(polygon, self.block_size):
+            # Sample terrain and surface heights from GeoTIFF tiles
+            # valid_mask marks points where both terrain and surface data exist
+            heights, valid_mask = self.sample_paired_heights(block, tiles)
+            grid_points_count += len(block)
+            block_count += 1
+
+            # Keep the surface of a single block to avoid sampling it twice
+            first_surface = heights[1, valid_mask] if block_count == 1 else None
+
+            if not valid_mask.any():
+                continue
+
+            # Base height is the minimum terrain elevation across all grid points
+            # This represents the lowest point of the terrain under the building
+            block_base = np.min(heights[0, valid_mask])
+            base_height = block_base if base_height is None else min(base_height, block_base)
+
+        if grid_points_count == 0:
+            return None
+        if base_height is None:
+            return grid_points_count, 0, np.nan, 0.0, 0.0
+
+        if first_surface is not None:
+            surfaces = [first_surface]
+        else:
+            surfaces = (
+                heights[1, valid_mask]
+                for heights, valid_mask in (
+                    self.sample_paired_heights(block, tiles)
+                    for block in self.iter_aligned_grid_blocks(polygon, self.block_size)
+                )
+            )
+
+        valid_count = 0
+        height_max = 0.0
+
+        def iter_building_heights():
+            nonlocal valid_count, height_max
+            for surface in surfaces:
+                if len(surface) == 0:
                     continue
+                # Calculate building heights relative to base
+                # Negative values (underground) are set to 0
+                building_heights = np.maximum(surface - base_height, 0)
+                valid_count += len(building_heights)
+                height_max = max(height_max, float(np.max(building_heights)))
+                yield building_heights.tolist()
 
-            src = self.tile_cache[cache_key]
+        height_sum = math.fsum(itertools.chain.from_iterable(iter_building_heights()))
 
-            try:
-                # Sample all points
-                sampled = list(src.sample(points, indexes=1))
+        return grid_points_count, valid_count, base_height, height_sum, height_max
 
-                for i, value in enumerate(sampled):
-                    if not np.isnan(value[0]) and value[0] != src.nodata:
-                        heights[i] = value[0]
-            except Exception as e:
-                print(f"Warning: Error sampling from {tile_id}: {e}", file=sys.stderr)
+    def get_tile_identity(self, tile_id, model_type):
+        """
+        Identify the raster file used for a tile without opening it
 
-        return heights
+        Returns 'model:filename:size:mtime', or 'model:tile_id:missing' if the
+        tile is not available. Memoized for the lifetime of the calculator.
+        """
+        cache_key = (model_type, tile_id)
+        if cache_key not in self.tile_identities:
+            tile_path = self.get_tile_path(tile_id, model_type)
+            if tile_path is None:
+                identity = f"{model_type}:{tile_id}:missing"
+            else:
+                stat = tile_path.stat()
+                identity = f"{model_type}:{tile_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+            self.tile_identities[cache_key] = identity
+        return self.tile_identities[cache_key]
 
     def calculate_building_volume(self, polygon, building_id=None, egid=None):
+        """
+        Calculate volume for a single building, using the result cache if enabled
+
+        The cache key covers the footprint WKB, the grid spacing and the identity
+        of every alti3d/surface3d tile the building needs, so a hit is returned
+        without opening any raster. Errors are not cached.
+        """
+        if self.result_cache is None:
+            return self.compute_building_volume(polygon, building_id, egid)
+
+        tiles = self.get_required_tiles(polygon.bounds)
+        tile_identities = [self.get_tile_identity(tile_id, model_type)
+                           for tile_id in tiles for model_type in ('alti3d', 'surface3d')]
+        key = make_cache_key(polygon.wkb, self.voxel_size, tile_identities)
+
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return {'id': building_id, 'egid': egid, **cached}
+
+        result = self.compute_building_volume(polygon, building_id, egid)
+        if result['status'] != 'error':
+            self.result_cache.put(key, tiles, result)
+        return result
+
+    def compute_building_volume(self, polygon, building_id=None, egid=None):
         """
         Calculate volume for a single building
 
         Steps:
         1. Generate aligned 1x1m grid points within building footprint
-        2. Sample terrain heights (swissALTI3D) at each grid point
-        3. Sample surface heights (swissSURFACE3D) at each grid point
-        4. Calculate base height as minimum terrain elevation
-        5. Calculate volume as sum of (surface - base) * 1m² for all points
+        2. Sample terrain (swissALTI3D) and surface (swissSURFACE3D) heights at
+           each grid point with one paired window read per tile
+        3. Calculate base height as minimum terrain elevation
+        4. Calculate volume as sum of (surface - base) * 1m² for all points
         """
         try:
-            # Create aligned grid points
-            grid_points = self.create_aligned_grid_points(polygon)
+            # Get required tiles based on building bounds
+            tiles = self.get_required_tiles(polygon.bounds)
+
+            # Create aligned grid points in bounded blocks and reduce their heights
+            stats = self.reduce_block_heights(polygon, tiles)
 
-            if len(grid_points) == 0:
+            if stats is None:
                 return {
                     'id': building_id,
                     'egid': egid,
@@ -318,19 +718,9 @@ class BuildingVolumeCalculator:
                     'status': 'no_grid_points'
                 }
 
-            # Get required tiles based on building bounds
-            tiles = self.get_required_tiles(polygon.bounds)
-
-            # Sample heights from GeoTIFF tiles
-            terrain_heights = self.sample_heights_from_tiles(grid_points, tiles, 'alti3d')
-            surface_heights = self.sample_heights_from_tiles(grid_points, tiles, 'surface3d')
-
-            # Filter valid points (where both terrain and surface data exist)
-            valid_mask = ~(np.isnan(terrain_heights) | np.isnan(surface_heights))
-            valid_terrain = terrain_heights[valid_mask]
-            valid_surface = surface_heights[valid_mask]
+            grid_points_count, valid_count, base_height, height_sum, height_max = stats
 
-            if len(valid_terrain) == 0:
+            if valid_count == 0:
                 return {
                     'id': building_id,
                     'egid': egid,
@@ -339,30 +729,22 @@ class BuildingVolumeCalculator:
                     'mean_height_m': 0,
                     'max_height_m': 0,
                     'base_height_m': np.nan,
-                    'grid_points_count': len(grid_points),
+                    'grid_points_count': grid_points_count,
                     'status': 'no_height_data'
                 }
 
-            # Calculate base height as minimum terrain elevation across all grid points
-            # This represents the lowest point of the terrain under the building
-            base_height = np.min(valid_terrain)
-
-            # Calculate building heights relative to base
-            # Negative values (underground) are set to 0
-            building_heights = np.maximum(valid_surface - base_height, 0)
-
             # Calculate total volume: sum of all heights × grid cell area (1m²)
-            volume = np.sum(building_heights) * (self.voxel_size ** 2)
+            volume = height_sum * (self.voxel_size ** 2)
 
             return {
                 'id': building_id,
                 'egid': egid,
                 'volume_m3': round(volume, 2),
                 'footprint_area_m2': round(polygon.area, 2),
-                'mean_height_m': round(np.mean(building_heights), 2),
-                'max_height_m': round(np.max(building_heights), 2),
+                'mean_height_m': round(height_sum / valid_count, 2),
+                'max_height_m': round(height_max, 2),
                 'base_height_m': round(base_height, 2),
-                'grid_points_count': len(valid_terrain),
+                'grid_points_count': valid_count,
                 'status': 'success'
             }
 
@@ -380,22 +762,146 @@ class BuildingVolumeCalculator:
                 'status': 'error'
             }
 
-    def process_buildings(self, buildings_gdf):
-        """Process all buildings and return results DataFrame"""
-        results = []
+    def calibrate_quick_mode(self, buildings_gdf, sample_size=DEFAULT_CALIBRATION_SIZE, seed=0):
+        """
+        Derive quick mode error bands from a calibration subset
+
+        A random sample of buildings is calculated both at full resolution and
+        at the current (coarse) voxel_size. The relative volume error per
+        footprint size class is summarized by its QUICK_ERROR_PERCENTILE, which
+        is then used as the error band for every building in that class.
+        """
+        quick_resolution = self.voxel_size
+        sample = buildings_gdf.sample(n=min(sample_size, len(buildings_gdf)), random_state=seed)
+
+        print(f"Calibrating {quick_resolution:g} m quick mode on {len(sample)} buildings...")
+
+        areas = []
+        errors = []
+        try:
+            for _, row in sample.iterrows():
+                if row.geometry.area < QUICK_MIN_CELLS * quick_resolution ** 2:
+                    continue
+
+                self.voxel_size = FULL_RESOLUTION
+                full = self.calculate_building_volume(row.geometry)
+                self.voxel_size = quick_resolution
+                quick = self.calculate_building_volume(row.geometry)
+
+                if full['status'] == 'success' and quick['status'] == 'success' and full['volume_m3'] > 0:
+                    areas.append(row.geometry.area)
+                    errors.append(abs(quick['volume_m3'] - full['volume_m3']) / full['volume_m3'])
+        finally:
+            self.voxel_size = quick_resolution
+
+        if not errors:
+            print("Warning: No successful calibration buildings, error bands unavailable", file=sys.stderr)
+            self.quick_error_model = None
+            return None
+
+        areas = np.array(areas)
+        errors = np.array(errors)
+        overall = float(np.percentile(errors, QUICK_ERROR_PERCENTILE))
+
+        # Per size class band, falling back to the overall band for sparse classes
+        size_class = np.digitize(areas, QUICK_SIZE_CLASSES) - 1
+        bands = []
+        for i in range(len(QUICK_SIZE_CLASSES) - 1):
+            class_errors = errors[size_class == i]
+            if len(class_errors) >= QUICK_MIN_CLASS_SAMPLES:
+                bands.append(float(np.percentile(class_errors, QUICK_ERROR_PERCENTILE)))
+            else:
+                bands.append(overall)
+
+        self.quick_error_model = {
+            'resolution_m': quick_resolution,
+            'samples': len(errors),
+            'overall': overall,
+            'bands': bands,
+        }
+
+        print(f"  {len(errors)} calibration buildings, P{QUICK_ERROR_PERCENTILE} relative error: {overall * 100:.1f}%")
+        for i, band in enumerate(bands):
+            print(f"  Footprint {QUICK_SIZE_CLASSES[i]:g}-{QUICK_SIZE_CLASSES[i + 1]:g} m²: ±{band * 100:.1f}%")
+
+        return self.quick_error_model
+
+    def get_quick_error_band(self, footprint_area):
+        """Relative volume error band for a footprint area, None if not calibrated"""
+        if self.quick_error_model is None:
+            return None
+        size_class = int(np.digitize(footprint_area, QUICK_SIZE_CLASSES)) - 1
+        size_class = min(max(size_class, 0), len(self.quick_error_model['bands']) - 1)
+        return self.quick_error_model['bands'][size_class]
+
+    def calculate_quick_volume(self, polygon, building_id=None, egid=None):
+        """
+        Calculate a coarse volume estimate at the current voxel_size
+
+        Small footprints (fewer than QUICK_MIN_CELLS coarse cells, or no coarse
+        grid point at all) fall back to full resolution. The result carries the
+        grid spacing used and the calibrated error band in m³.
+        """
+        result = None
+        if polygon.area >= QUICK_MIN_CELLS * self.voxel_size ** 2:
+            result = self.calculate_building_volume(polygon, building_id, egid)
+            result['resolution_m'] = self.voxel_size
+
+        if result is None or result['status'] == 'no_grid_points':
+            quick_resolution = self.voxel_size
+            self.voxel_size = FULL_RESOLUTION
+            try:
+                result = self.calculate_building_volume(polygon, building_id, egid)
+            finally:
+                self.voxel_size = quick_resolution
+            result['resolution_m'] = FULL_RESOLUTION
+            result['volume_error_m3'] = 0.0 if result['status'] == 'success' else np.nan
+            return result
+
+        band = self.get_quick_error_band(polygon.area)
+        if result['status'] == 'success' and band is not None:
+            result['volume_error_m3'] = round(result['volume_m3'] * band, 2)
+        else:
+            result['volume_error_m3'] = np.nan
+
+        return result
+
+    def process_buildings(self, buildings_gdf, on_batch=None, batch_size=DEFAULT_RESULT_BATCH_SIZE):
+        """
+        Process all buildings
+
+        Results are accumulated in a columnar ResultBuffer. If on_batch is given,
+        every batch of batch_size results is passed to it as a DataFrame and
+        nothing is kept afterwards; otherwise all batches are concatenated and
+        returned as one results DataFrame.
+        """
         total = len(buildings_gdf)
+        quick = self.voxel_size != FULL_RESOLUTION
 
-        for idx, row in buildings_gdf.iterrows():
-            print(f"Processing building {len(results) + 1}/{total}", end='\r')
+        batches = []
+        columns = RESULT_COLUMNS + (QUICK_RESULT_COLUMNS if quick else [])
+        buffer = ResultBuffer(columns, batch_size, on_batch or batches.append)
+
+        for i, (idx, row) in enumerate(buildings_gdf.iterrows(), start=1):
+            print(f"Processing building {i}/{total}", end='\r')
             building_id = row['id']
             egid = row.get('egid', None)
-            result = self.calculate_building_volume(row.geometry, building_id, egid)
-            results.append(result)
+            if quick:
+                result = self.calculate_quick_volume(row.geometry, building_id, egid)
+            else:
+                result = self.calculate_building_volume(row.geometry, building_id, egid)
+            buffer.append(result)
 
+        buffer.flush()
         print(f"\nProcessed {total} buildings")
-        return pd.DataFrame(results)
 
-    def write_results_to_db(self, results_df, table_name='public.buildings'):
+        if on_batch is not None:
+            return None
+        if not batches:
+            return pd.DataFrame(columns=[name for name, _ in columns])
+        return pd.concat(batches, ignore_index=True)
+
+    def write_results_to_db(self, results_df, table_name='public.buildings', ensure_columns=True):
         """
         Write calculated volumes back to database
 
@@ -413,21 +919,22 @@ class BuildingVolumeCalculator:
         conn = self.get_database_connection()
         cursor = conn.cursor()
 
-        # Ensure columns exist
-        columns = [
-            ('volume_above_ground_m3', 'numeric'),
-            ('elevation_base_m', 'numeric'),
-            ('height_mean_m', 'numeric'),
-            ('height_max_m', 'numeric'),
-        ]
+        # Ensure columns exist (once per run when writing in batches)
+        if ensure_columns:
+            columns = [
+                ('volume_above_ground_m3', 'numeric'),
+                ('elevation_base_m', 'numeric'),
+                ('height_mean_m', 'numeric'),
+                ('height_max_m', 'numeric'),
+            ]
 
-        for col_name, col_type in columns:
-            cursor.execute(f"""
-                ALTER TABLE {table_name}
-                ADD COLUMN IF NOT EXISTS {col_name} {col_type}
-            """)
+            for col_name, col_type in columns:
+                cursor.execute(f"""
+                    ALTER TABLE {table_name}
+                    ADD COLUMN IF NOT EXISTS {col_name} {col_type}
+                """)
 
-        conn.commit()
+            conn.commit()
 
         # Update rows (only successful calculations)
         successful = results_df[results_df['status'] == 'success']
@@ -483,12 +990,26 @@ def main():
                        help='Bounding box in WGS84 coordinates')
     parser.add_argument('--building-ids', nargs='+', type=int,
                        help='Process specific building IDs')
+    parser.add_argument('--building-ids-file',
+                       help="File with building IDs to process, one per line ('-' reads from stdin)")
     parser.add_argument('--write-to-db', action='store_true',
                        help='Write results back to database (updates volume_above_ground_m3, elevation_base_m, height_mean_m, height_max_m)')
     parser.add_argument('--geometry-column', default='geog',
                        help='Name of geometry column (default: geog)')
     parser.add_argument('--table-name', default='public.buildings',
                        help='Table name (default: public.buildings)')
+    parser.add_argument('--resolution', type=float, default=FULL_RESOLUTION,
+                       help=f'Grid spacing in meters (default: {FULL_RESOLUTION:g}); coarser values give a quick estimate with error bands')
+    parser.add_argument('--quick', action='store_true',
+                       help=f'Quick estimate mode, shortcut for --resolution {QUICK_RESOLUTION:g}')
+    parser.add_argument('--calibration-size', type=int, default=DEFAULT_CALIBRATION_SIZE,
+                       help=f'Buildings calculated at full resolution to derive quick mode error bands (default: {DEFAULT_CALIBRATION_SIZE})')
+    parser.add_argument('--cache',
+                       help='SQLite result cache; unchanged buildings are answered without opening rasters')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_RESULT_BATCH_SIZE,
+                       help=f'Results buffered before they are flushed to CSV/database (default: {DEFAULT_RESULT_BATCH_SIZE})')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                       help=f'Grid points per block for large footprints, bounds sampling memory per building (default: {DEFAULT_BLOCK_SIZE})')
 
     args = parser.parse_args()
 
@@ -501,20 +1022,48 @@ def main():
         print(f"Error: SURFACE3D directory not found: {args.surface3d_dir}", file=sys.stderr)
         return 1
 
+    if args.quick:
+        args.resolution = QUICK_RESOLUTION
+
+    if args.resolution <= 0:
+        print("Error: --resolution must be positive", file=sys.stderr)
+        return 1
+
+    # Coarse estimates must not overwrite full resolution values in the database
+    if args.resolution != FULL_RESOLUTION and args.write_to_db:
+        print("Error: Quick estimates (--quick/--resolution) can only be exported with --output", file=sys.stderr)
+        return 1
+
     # Initialize calculator
     try:
         calc = BuildingVolumeCalculator(args.db_connection, args.alti3d_dir, args.surface3d_dir)
+        calc.block_size = args.block_size
+        calc.voxel_size = args.resolution
+        if args.cache:
+            calc.result_cache = ResultCache(args.cache)
     except Exception as e:
         print(f"Error connecting to database: {e}", file=sys.stderr)
         return 1
 
+    # Collect building IDs from command line and/or file
+    building_ids = list(args.building_ids or [])
+    if args.building_ids_file:
+        try:
+            building_ids.extend(read_building_ids(args.building_ids_file))
+        except Exception as e:
+            print(f"Error reading building IDs: {e}", file=sys.stderr)
+            return 1
+        if not building_ids:
+            print(f"Error: No building IDs found in {args.building_ids_file}", file=sys.stderr)
+            return 1
+
     # Load buildings
     try:
         buildings = calc.load_buildings_from_db(
             table_name=args.table_name,
             geom_column=args.geometry_column,
             bbox=args.bbox,
-            building_ids=args.building_ids,
+            building_ids=building_ids,
             limit=args.limit
         )
     except Exception as e:
@@ -530,43 +1079,91 @@ def main():
         print("Error: Must specify either --output for CSV export or --write-to-db for database update", file=sys.stderr)
         return 1
 
-    # Process buildings
-    results = calc.process_buildings(buildings)
+    # Calibrate quick mode error bands against full resolution
+    if calc.voxel_size != FULL_RESOLUTION and args.calibration_size > 0:
+        calc.calibrate_quick_mode(buildings, args.calibration_size)
+
+    # Running totals for the summary, so no full results table is kept
+    summary = {
+        'total': 0,
+        'successful': 0,
+        'volume_m3': 0.0,
+        'mean_height_m': 0.0,
+        'grid_points_count': 0,
+        'volume_error_m3': 0.0,
+        'status': {},
+    }
+
+    def handle_batch(batch):
+        first_batch = summary['total'] == 0
+
+        # Append to CSV if output file specified
+        if args.output:
+            batch.to_csv(args.output, mode='w' if first_batch else 'a', header=first_batch, index=False)
+
+        # Write to database if requested
+        if args.write_to_db:
+            calc.write_results_to_db(batch, table_name=args.table_name, ensure_columns=first_batch)
+
+        successful = batch[batch['status'] == 'success']
+        summary['total'] += len(batch)
+        summary['successful'] += len(successful)
+        summary['volume_m3'] += successful['volume_m3'].sum()
+        summary['mean_height_m'] += successful['mean_height_m'].sum()
+        summary['grid_points_count'] += int(successful['grid_points_count'].sum())
+        if 'volume_error_m3' in successful.columns:
+            summary['volume_error_m3'] += successful['volume_error_m3'].sum()
+        for status, count in batch['status'].value_counts().items():
+            if count:
+                summary['status'][status] = summary['status'].get(status, 0) + count
+
+    # Process buildings, streaming result batches to CSV and/or database
+    try:
+        calc.process_buildings(buildings, on_batch=handle_batch, batch_size=args.batch_size)
+    except Exception as e:
+        print(f"Error processing buildings: {e}", file=sys.stderr)
+        if calc.result_cache is not None:
+            calc.result_cache.close()
+        return 1
 
-    # Save CSV if output file specified
     if args.output:
-        results.to_csv(args.output, index=False)
         print(f"\nResults saved to: {args.output}")
 
-    # Write to database if requested
-    if args.write_to_db:
-        try:
-            calc.write_results_to_db(results, table_name=args.table_name)
-        except Exception as e:
-            print(f"Error writing to database: {e}", file=sys.stderr)
-            return 1
-
     # Clean up
     calc.close_tile_cache()
 
+    cache_stats = None
+    if calc.result_cache is not None:
+        session_hits, session_rate = calc.result_cache.hits, calc.result_cache.hit_rate()
+        cache_stats = calc.result_cache.stats()
+        calc.result_cache.close()
+
     # Print summary
     print("\n" + "="*50)
     print("SUMMARY")
     print("="*50)
-    successful = results[results['status'] == 'success']
-    print(f"Successful: {len(successful)}/{len(results)}")
-
-    if len(successful) > 0:
-        print(f"Total volume: {successful['volume_m3'].sum():,.0f} m³")
-        print(f"Avg volume: {successful['volume_m3'].mean():,.0f} m³")
-        print(f"Avg height: {successful['mean_height_m'].mean():.1f} m")
-        print(f"Avg grid points per building: {successful['grid_points_count'].mean():.0f}")
+    successful = summary['successful']
+    print(f"Successful: {successful}/{summary['total']}")
+
+    if successful > 0:
+        print(f"Total volume: {summary['volume_m3']:,.0f} m³")
+        if calc.voxel_size != FULL_RESOLUTION:
+            print(f"Quick estimate error band: ±{summary['volume_error_m3']:,.0f} m³ "
+                  f"({calc.voxel_size:g} m grid)")
+        print(f"Avg volume: {summary['volume_m3'] / successful:,.0f} m³")
+        print(f"Avg height: {summary['mean_height_m'] / successful:.1f} m")
+        print(f"Avg grid points per building: {summary['grid_points_count'] / successful:.0f}")
 
     # Status breakdown
     print("\nStatus breakdown:")
-    for status, count in results['status'].value_counts().items():
+    for status, count in sorted(summary['status'].items(), key=lambda item: -item[1]):
         print(f"  {status}: {count}")
 
+    if cache_stats is not None:
+        print("\nResult cache:")
+        print(f"  Hits: {session_hits} ({session_rate * 100:.1f}%)")
+        print(f"  Entries: {cache_stats['entries']:,} ({cache_stats['size_bytes'] / 1024 / 1024:.1f} MB)")
+
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tile Preparation for swissALTI3D / swissSURFACE3D
+Rewrites a directory of elevation tiles into internally tiled, compressed
+Cloud-Optimized GeoTIFFs (COG) with overviews.
+
+Raw swisstopo downloads are not guaranteed to be internally tiled, so the small
+windowed reads done by the volume estimator can end up decoding whole strips.
+Block-aligned internal tiles keep every read limited to the few blocks it touches.
+
+Filenames are kept unchanged, so the output directory can be passed to main.py
+directly (see index_tile_directory for the expected naming convention).
+
+Usage:
+    python prepare_tiles.py <input_dir> <output_dir> [options]
+
+Example:
+    python prepare_tiles.py "D:\\SwissAlti3D" "D:\\SwissAlti3D_COG" --workers 8 --benchmark 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+import rasterio
+import rasterio.shutil
+from rasterio.windows import Window
+
+from main import index_tile_directory
+
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_COMPRESSION = 'DEFLATE'
+
+# Window size (pixels) used by the read benchmark, roughly a large building
+# footprint on the 0.5 m elevation grid
+BENCHMARK_WINDOW = 64
+BENCHMARK_READS_PER_TILE = 50
+
+
+def is_prepared(path, block_size):
+    """Check if a GeoTIFF is already internally tiled with the requested block size and has overviews"""
+    try:
+        with rasterio.open(path) as src:
+            profile = src.profile
+            return (
+                profile.get('tiled', False)
+                and profile.get('blockxsize') == block_size
+                and profile.get('blockysize') == block_size
+                and len(src.overviews(1)) > 0
+            )
+    except Exception:
+        return False
+
+
+def prepare_tile(src_path, dst_path, block_size=DEFAULT_BLOCK_SIZE, compression=DEFAULT_COMPRESSION,
+                 overwrite=False):
+    """
+    Convert a single tile into a Cloud-Optimized GeoTIFF
+
+    Idempotent: tiles that already exist in the output directory with the
+    requested layout (and are newer than their source) are skipped. The COG is
+    written to a temporary file and renamed, so an interrupted run never leaves
+    a partial tile behind.
+
+    Returns: (filename, status) with status 'converted' or 'skipped'
+    """
+    src_path = Path(src_path)
+    dst_path = Path(dst_path)
+
+    if (not overwrite and dst_path.exists()
+            and dst_path.stat().st_mtime >= src_path.stat().st_mtime
+            and is_prepared(dst_path, block_size)):
+        return src_path.name, 'skipped'
+
+    tmp_path = dst_path.with_name(dst_path.name + '.tmp')
+
+    with rasterio.open(src_path) as src:
+        # Floating point predictor works best for elevation values
+        predictor = 3 if np.dtype(src.dtypes[0]).kind == 'f' else 2
+
+        rasterio.shutil.copy(
+            src,
+            tmp_path,
+            driver='COG',
+            BLOCKSIZE=block_size,
+            COMPRESS=compression,
+            PREDICTOR=predictor,
+            OVERVIEWS='AUTO',
+            RESAMPLING='AVERAGE',
+            BIGTIFF='IF_SAFER',
+            NUM_THREADS=1,
+        )
+
+    os.replace(tmp_path, dst_path)
+    return src_path.name, 'converted'
+
+
+def benchmark_reads(paths, reads_per_tile=BENCHMARK_READS_PER_TILE, window_size=BENCHMARK_WINDOW, seed=0):
+    """
+    Time small random windowed reads, like those done per building
+
+    Returns: average milliseconds per read
+    """
+    rng = np.random.default_rng(seed)
+    total_time = 0.0
+    total_reads = 0
+
+    for path in paths:
+        with rasterio.open(path) as src:
+            max_row = max(src.height - window_size, 1)
+            max_col = max(src.width - window_size, 1)
+
+            for _ in range(reads_per_tile):
+                window = Window(int(rng.integers(0, max_col)), int(rng.integers(0, max_row)),
+                                window_size, window_size)
+                start = time.perf_counter()
+                src.read(1, window=window)
+                total_time += time.perf_counter() - start
+                total_reads += 1
+
+    return total_time / total_reads * 1000 if total_reads else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rewrite swissALTI3D/swissSURFACE3D tiles into tiled, compressed Cloud-Optimized GeoTIFFs'
+    )
+    parser.add_argument('input_dir',
+                        help='Directory containing raw elevation tiles')
+    parser.add_argument('output_dir',
+                        help='Directory for prepared tiles (filenames are kept)')
+    parser.add_argument('--workers', type=int,
+                        help='Number of parallel workers (default: CPU count - 1)')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f'Internal tile size in pixels (default: {DEFAULT_BLOCK_SIZE})')
+    parser.add_argument('--compression', default=DEFAULT_COMPRESSION,
+                        help=f'GDAL compression (default: {DEFAULT_COMPRESSION}, e.g. LZW, ZSTD)')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Rewrite tiles even if a prepared version already exists')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Compare random window read times before/after on N tiles')
+
+    args = parser.parse_args()
+
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
+
+    if not input_dir.is_dir():
+        print(f"Error: Input directory not found: {input_dir}", file=sys.stderr)
+        return 1
+
+    if input_dir.resolve() == output_dir.resolve():
+        print("Error: Output directory must differ from input directory", file=sys.stderr)
+        return 1
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Only convert files main.py would index, so both directories stay in sync
+    tiles = index_tile_directory(input_dir)
+    print(f"Found {len(tiles)} tiles in {input_dir}")
+
+    if not tiles:
+        return 0
+
+    num_workers = args.workers or max(os.cpu_count() - 1, 1)
+    counts = {'converted': 0, 'skipped': 0, 'failed': 0}
+    start_time = time.time()
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {
+            executor.submit(prepare_tile, path, output_dir / path.name,
+                            args.block_size, args.compression, args.overwrite): path
+            for path in tiles.values()
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                _, status = future.result()
+                counts[status] += 1
+            except Exception as e:
+                print(f"\nError preparing {path.name}: {e}", file=sys.stderr)
+                counts['failed'] += 1
+            print(f"Prepared {done}/{len(tiles)} tiles", end='\r')
+
+    elapsed = time.time() - start_time
+    print(f"\nFinished in {elapsed:.1f} seconds")
+    print(f"  converted: {counts['converted']}")
+    print(f"  skipped (already prepared): {counts['skipped']}")
+    print(f"  failed: {counts['failed']}")
+
+    if args.benchmark:
+        sample = sorted(tiles)[:args.benchmark]
+        before = benchmark_reads([tiles[t] for t in sample])
+        after = benchmark_reads([output_dir / tiles[t].name for t in sample
+                                 if (output_dir / tiles[t].name).exists()])
+
+        print("\n" + "=" * 50)
+        print("READ BENCHMARK")
+        print("=" * 50)
+        print(f"Tiles: {len(sample)}, {BENCHMARK_READS_PER_TILE} random "
+              f"{BENCHMARK_WINDOW}x{BENCHMARK_WINDOW} px windows per tile")
+        print(f"  Raw tiles:      {before:.2f} ms/read")
+        print(f"  Prepared tiles: {after:.2f} ms/read")
+        if after > 0:
+            print(f"  Speedup:        {before / after:.1f}x")
+
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Persistent Result Cache for the Volume Estimator
+Stores per-building volume metrics in a local SQLite file, keyed by a hash of
+the footprint WKB, the grid spacing and the identities of the swissALTI3D and
+swissSURFACE3D tiles used. A building whose footprint and tiles have not changed
+since the last run is answered from the cache without opening any raster.
+
+Because tile identities are part of the key, replacing a tile (new year, new
+file) automatically turns all affected entries into misses. Stale entries can
+be pruned by age or invalidated explicitly per tile.
+
+Usage:
+    python result_cache.py stats <cache_db>
+    python result_cache.py prune <cache_db> --older-than DAYS
+    python result_cache.py invalidate <cache_db> --tiles 2609-1176 2610-1176
+    python result_cache.py clear <cache_db>
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Metrics stored per building (id/egid are attached again on a hit)
+CACHED_METRICS = [
+    'volume_m3',
+    'footprint_area_m2',
+    'mean_height_m',
+    'max_height_m',
+    'base_height_m',
+    'grid_points_count',
+    'status',
+]
+
+# Pending writes are committed in batches, one commit per put is too slow
+COMMIT_EVERY = 1000
+
+SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        tiles TEXT NOT NULL,
+        {', '.join(f'{name} {"TEXT" if name == "status" else "REAL"}' for name in CACHED_METRICS)},
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS stats (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+"""
+
+
+def make_cache_key(footprint_wkb, voxel_size, tile_identities):
+    """
+    Build the cache key for a building
+
+    tile_identities is a list of strings describing each alti3d/surface3d tile
+    used (see BuildingVolumeCalculator.get_tile_identity).
+    """
+    digest = hashlib.sha256()
+    digest.update(footprint_wkb)
+    digest.update(f"|{voxel_size!r}|".encode())
+    digest.update('|'.join(tile_identities).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of per-building volume metrics.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+        self.pending = {}
+
+    def get(self, key):
+        """Return cached metrics dict or None"""
+        if key in self.pending:
+            row = self.pending[key][2:2 + len(CACHED_METRICS)]
+        else:
+            row = self.conn.execute(
+                f"SELECT {', '.join(CACHED_METRICS)} FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        metrics = dict(zip(CACHED_METRICS, row))
+        metrics['grid_points_count'] = int(metrics['grid_points_count'])
+        if metrics['base_height_m'] is None:
+            metrics['base_height_m'] = float('nan')
+        return metrics
+
+    def put(self, key, tiles, result):
+        """Queue a result for storage; committed every COMMIT_EVERY entries"""
+        values = []
+        for name in CACHED_METRICS:
+            value = result.get(name)
+            # NaN is stored as NULL
+            if isinstance(value, float) and value != value:
+                value = None
+            elif name not in ('status', 'grid_points_count') and value is not None:
+                value = float(value)
+            values.append(value)
+
+        self.pending[key] = (key, ','.join(tiles), *values, time.time())
+        if len(self.pending) >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        """Write pending entries and session hit/miss counters"""
+        if self.pending:
+            placeholders = ','.join('?' * (len(CACHED_METRICS) + 3))
+            self.conn.executemany(f"""
+                INSERT OR REPLACE INTO results (key, tiles, {', '.join(CACHED_METRICS)}, created_at)
+                VALUES ({placeholders})
+            """, list(self.pending.values()))
+            self.pending = {}
+        self.conn.commit()
+
+    def close(self):
+        self.commit()
+        for name, value in (('hits', self.hits), ('misses', self.misses)):
+            self.conn.execute("""
+                INSERT INTO stats (name, value) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+            """, (name, value))
+        self.conn.commit()
+        self.conn.close()
+
+    def hit_rate(self):
+        """Hit rate of the current session"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Return entry count, file size and cumulative hit/miss counters"""
+        self.commit()
+        entries = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        counters = dict(self.conn.execute("SELECT name, value FROM stats").fetchall())
+        size_bytes = sum(p.stat().st_size for p in self.path.parent.glob(self.path.name + '*'))
+        return {
+            'entries': entries,
+            'size_bytes': size_bytes,
+            'hits': counters.get('hits', 0) + self.hits,
+            'misses': counters.get('misses', 0) + self.misses,
+        }
+
+    def prune(self, older_than_days):
+        """Delete entries created more than older_than_days ago. Returns number deleted."""
+        cutoff = time.time() - older_than_days * 86400
+        cursor = self.conn.execute("DELETE FROM results WHERE created_at < ?", (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def invalidate_tiles(self, tile_ids):
+        """Delete all entries that used any of the given tile IDs. Returns number deleted."""
+        deleted = 0
+        for tile_id in tile_ids:
+            cursor = self.conn.execute(
+                "DELETE FROM results WHERE ',' || tiles || ',' LIKE ?", (f"%,{tile_id},%",)
+            )
+            deleted += cursor.rowcount
+        self.conn.commit()
+        return deleted
+
+    def clear(self):
+        """Delete all entries and counters"""
+        self.conn.execute("DELETE FROM results")
+        self.conn.execute("DELETE FROM stats")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Inspect and maintain the volume estimator result cache'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats_parser = subparsers.add_parser('stats', help='Show cache size and hit rate')
+    stats_parser.add_argument('cache_db', help='SQLite cache file')
+
+    prune_parser = subparsers.add_parser('prune', help='Delete old entries')
+    prune_parser.add_argument('cache_db', help='SQLite cache file')
+    prune_parser.add_argument('--older-than', type=float, required=True, metavar='DAYS',
+                              help='Delete entries created more than DAYS ago')
+
+    invalidate_parser = subparsers.add_parser('invalidate', help='Delete entries using specific tiles')
+    invalidate_parser.add_argument('cache_db', help='SQLite cache file')
+    invalidate_parser.add_argument('--tiles', nargs='+', required=True,
+                                   help='Tile IDs (e.g., 2609-1176)')
+
+    clear_parser = subparsers.add_parser('clear', help='Delete all entries')
+    clear_parser.add_argument('cache_db', help='SQLite cache file')
+
+    args = parser.parse_args()
+
+    if not Path(args.cache_db).exists():
+        print(f"Error: Cache file not found: {args.cache_db}", file=sys.stderr)
+        return 1
+
+    cache = ResultCache(args.cache_db)
+
+    if args.command == 'stats':
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        print(f"Entries: {stats['entries']:,}")
+        print(f"Size: {stats['size_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"Lookups: {lookups:,} ({stats['hits']:,} hits, {stats['misses']:,} misses)")
+        if lookups:
+            print(f"Hit rate: {stats['hits'] / lookups * 100:.1f}%")
+    elif args.command == 'prune':
+        print(f"Deleted {cache.prune(args.older_than)} entries")
+    elif args.command == 'invalidate':
+        print(f"Deleted {cache.invalidate_tiles(args.tiles)} entries")
+    elif args.command == 'clear':
+        cache.clear()
+        print("Cache cleared")
+
+    cache.conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
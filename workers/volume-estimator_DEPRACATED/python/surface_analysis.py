@@ -4,9 +4,47 @@ Analyzes building surfaces to calculate roof, footprint, and wall areas
 """
 
 import numpy as np
-import trimesh
 import logging
 
+# Faces whose cross product norm is below this are degenerate (zero normal), as in trimesh
+DEGENERATE_FACE_TOLERANCE = float(np.finfo(np.float64).resolution * 100)
+
+def compute_mesh_metrics(vertices, faces):
+    """
+    Face normals, areas, centroids, total area and Z extent computed with NumPy.
+
+    Same formulas as trimesh, without building a trimesh.Trimesh (surface
+    analysis needs no topology repair). Faces that reference non-finite
+    vertices are dropped.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    
+    triangles = vertices[faces]
+    finite = np.isfinite(triangles).all(axis=(1, 2))
+    if not finite.all():
+        triangles = triangles[finite]
+    
+    edges = triangles[:, 1:, :] - triangles[:, :2, :]
+    crosses = np.cross(edges[:, 0], edges[:, 1])
+    
+    norms = np.sqrt(np.dot(crosses * crosses, [1.0, 1.0, 1.0]))
+    valid = norms > DEGENERATE_FACE_TOLERANCE
+    face_normals = np.zeros_like(crosses)
+    face_normals[valid] = crosses[valid] * np.reciprocal(norms[valid]).reshape((-1, 1))
+    
+    face_areas = np.sqrt((crosses ** 2).sum(axis=1)) / 2.0
+    triangle_z = triangles[:, :, 2]
+    
+    return {
+        'face_normals': face_normals,
+        'face_areas': face_areas,
+        'face_centroids': triangles.mean(axis=1),
+        'total_area': face_areas.sum(),
+        'min_z': triangle_z.min() if len(triangles) else None,
+        'max_z': triangle_z.max() if len(triangles) else None,
+    }
+
 def classify_face_orientation(normal_z, horizontal_tolerance=10.0, vertical_tolerance=10.0):
     """Classify face as horizontal, vertical, or sloped"""
     horizontal_tol_rad = np.radians(horizontal_tolerance)
@@ -51,17 +89,12 @@ def analyze_building_surfaces(vertices, faces):
             result['surf_analysis_error'] = "No vertices or faces provided"
             return result
         
-        # Create trimesh directly from vertices and faces
-        mesh = trimesh.Trimesh(
-            vertices=np.array(vertices),
-            faces=np.array(faces),
-            process=True  # Merge duplicate vertices
-        )
-        
-        # Get mesh properties
-        face_normals = mesh.face_normals
-        face_areas = mesh.area_faces
-        face_centroids = mesh.triangles_center
+        # Get mesh properties of the mesh as read; the repair in process_building_mesh
+        # only affects the volume, these metrics never needed trimesh's topology
+        mesh = compute_mesh_metrics(vertices, faces)
+        face_normals = mesh['face_normals']
+        face_areas = mesh['face_areas']
+        face_centroids = mesh['face_centroids']
         
         # Initialize accumulators
         roof_area = 0.0
@@ -111,18 +144,17 @@ def analyze_building_surfaces(vertices, faces):
         result['surf_footprint_area'] = float(footprint_area)
         result['surf_wall_area'] = float(wall_area)
         result['surf_sloped_area'] = float(sloped_area)
-        result['surf_total_area'] = float(mesh.area)
+        result['surf_total_area'] = float(mesh['total_area'])
         
         result['surf_horizontal_faces'] = len(horizontal_faces)
         result['surf_vertical_faces'] = len(vertical_faces)
         result['surf_sloped_faces'] = len(sloped_faces)
         
         # Building height and elevation
-        if len(mesh.vertices) > 0:
-            z_coords = mesh.vertices[:, 2]
-            result['surf_min_elevation'] = float(np.min(z_coords))
-            result['surf_max_elevation'] = float(np.max(z_coords))
-            result['surf_building_height'] = float(np.max(z_coords) - np.min(z_coords))
+        if mesh['min_z'] is not None:
+            result['surf_min_elevation'] = float(mesh['min_z'])
+            result['surf_max_elevation'] = float(mesh['max_z'])
+            result['surf_building_height'] = float(mesh['max_z'] - mesh['min_z'])
             
             # Wall perimeter estimation
             if wall_area > 0 and result['surf_building_height'] > 0: